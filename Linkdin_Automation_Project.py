@@ -1,37 +1,175 @@
+import ast
 import json
+import math
+import itertools
+import sys
 import time
 import csv
 import os
-import requests
 import random
 import re
-from playwright.sync_api import sync_playwright
+import hashlib
+import html
+import sqlite3
+import threading
+import queue
+import shutil
+import subprocess
+from collections import deque
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 from dotenv import load_dotenv
 env_path = os.path.join(os.path.dirname(__file__), ".env")
-load_dotenv(dotenv_path=env_path, override=True)
-import psycopg2
-from psycopg2.extras import execute_values
+# A profile process started by run_profiles gets its settings through the environment; .env
+# only fills in what the profile left unset there
+load_dotenv(dotenv_path=env_path, override=os.getenv("profile_name") is None)
+# requests, Playwright and psycopg2 are imported where they are first needed, so subcommands
+# that never touch the network, the browser or Postgres start without loading them
 
 LINKEDIN_USERNAME = os.getenv("LINKEDIN_USERNAME")
 LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 RESUME_PATH = os.getenv("resume_path")
 TARGET_JOB_TITLE = os.getenv("target_job_title")
 TARGET_LOCATION = os.getenv("target_location")
-LOG_FILE_PATH = os.getenv("log_file_path")
+LOG_FILE_PATH = os.getenv("log_file_path")  # the legacy CSV log; only read by migrate-log
+APPLICATION_LOG_PATH = os.getenv("application_log_path", "application_log.jsonl")
 OPENWEBUI_API = os.getenv("OPENWEBUI_API_URL")
 OPENWEBUI_MODEL = "gemma3:12b"
+LLM_MAX_CONCURRENCY = int(os.getenv("llm_max_concurrency", 4))
+LLM_REQUEST_TIMEOUT = float(os.getenv("llm_request_timeout", 60))
+# Streaming answers stop as soon as the expected shape (number, Yes/No, JSON object) is complete;
+# the token and latency budgets bound every question, after which the fallback answer is used
+LLM_STREAMING = os.getenv("llm_streaming", "true").lower() == "true"
+LLM_ANSWER_MAX_TOKENS = int(os.getenv("llm_answer_max_tokens", 64))
+LLM_ANSWER_DEADLINE_SECONDS = float(os.getenv("llm_answer_deadline_seconds", 30))
+LLM_FALLBACK_ANSWER = os.getenv("llm_fallback_answer", "")
+CONCURRENT_LLM_ANSWERS = os.getenv("concurrent_llm_answers", "true").lower() == "true"
+LLM_BATCH_QUESTIONS = os.getenv("llm_batch_questions", "true").lower() == "true"
 MAX_JOBS_PER_RUN = int(os.getenv("max_jobs_per_run", 50))
+APPLY_WORKERS = int(os.getenv("apply_workers", 1))
+APPLY_MIN_INTERVAL_SECONDS = float(os.getenv("apply_min_interval_seconds", 20))
+STORAGE_STATE_PATH = os.getenv("storage_state_path", "linkedin_state.json")
+JOB_INDEX_PATH = os.getenv("job_index_path", "job_index.db")
+JOB_DETAILS_PREFETCH = os.getenv("job_details_prefetch", "true").lower() == "true"
+PREFETCH_AHEAD = int(os.getenv("prefetch_ahead", 2))
+JOB_RANKING = os.getenv("job_ranking", "true").lower() == "true"
+RELEVANCE_MIN_SCORE = float(os.getenv("relevance_min_score", 0.05))
+RELEVANCE_TOP_K = int(os.getenv("relevance_top_k", 0))  # 0 = up to max_jobs
+RANK_WINDOW = int(os.getenv("rank_window", 10))  # jobs ranked side by side in the streaming pipeline
+EXCLUDED_COMPANIES = [c.strip().lower() for c in os.getenv("excluded_companies", "").split(",") if c.strip()]
+EXCLUDED_TITLE_KEYWORDS = [
+    w.strip().lower()
+    for w in os.getenv("excluded_title_keywords", "senior,sr,lead,principal,staff,director,head,vp").split(",")
+    if w.strip()
+]
+SEARCH_SWEEP = os.getenv("search_sweep", "false").lower() == "true"
+SEARCH_TITLES = [t.strip() for t in os.getenv("search_titles", TARGET_JOB_TITLE or "").split(",") if t.strip()]
+SEARCH_LOCATIONS = [l.strip() for l in os.getenv("search_locations", TARGET_LOCATION or "").split(",") if l.strip()]
+SEARCH_DATE_POSTED = [d.strip() for d in os.getenv("search_date_posted", "any").split(",") if d.strip()]  # any/day/week/month
+SEARCH_WORKPLACES = [w.strip() for w in os.getenv("search_workplaces", "any").split(",") if w.strip()]  # any/onsite/remote/hybrid
+SEARCH_PAGES_PER_QUERY = int(os.getenv("search_pages_per_query", 5))
+SEARCH_SWEEP_MIN_DELAY = float(os.getenv("search_sweep_min_delay", 2))
+SEARCH_SWEEP_MAX_DELAY = float(os.getenv("search_sweep_max_delay", 5))
+ALLOWED_LOCATION_KEYWORDS = [l.strip().lower() for l in os.getenv("allowed_locations", "").split(",") if l.strip()]
+PACING_MIN_SECONDS = float(os.getenv("pacing_min_seconds", 15))
+PACING_MAX_SECONDS = float(os.getenv("pacing_max_seconds", 40))
+DOM_WAIT_TIMEOUT_MS = int(os.getenv("dom_wait_timeout_ms", 15000))
+METRICS_PATH = os.getenv("metrics_path", "run_metrics.jsonl")  # empty disables the JSON-lines export
+METRICS_PORT = int(os.getenv("metrics_port", 0))  # > 0 serves Prometheus text on /metrics
+CHECKPOINT_PATH = os.getenv("checkpoint_path", "run_checkpoint.json")
+PROFILE_NAME = os.getenv("profile_name", "default")
+PROFILES_STATE_DIR = os.getenv("profiles_state_dir", "profiles")
+PROFILE_CONCURRENCY = int(os.getenv("profile_concurrency", 0))  # 0 = half the CPU cores
+BROWSER_DAEMON_PORT = int(os.getenv("browser_daemon_port", 9333))
+BROWSER_DAEMON_STATE_PATH = os.getenv("browser_daemon_state_path", "browser_daemon.json")
+BROWSER_PROFILE_DIR = os.getenv("browser_profile_dir", "browser_profile")
+HEADLESS = os.getenv("headless", "false").lower() == "true"
+BLOCK_RESOURCES = os.getenv("block_resources", "true").lower() == "true"
+BLOCKED_RESOURCE_TYPES = [t.strip() for t in os.getenv("blocked_resource_types", "image,media,font").split(",") if t.strip()]
+BLOCKED_URL_PATTERNS = [
+    u.strip().lower()
+    for u in os.getenv(
+        "blocked_url_patterns",
+        "px.ads.linkedin.com,/li/track,/tscp-serving/,/sensorcollect,snap.licdn.com,doubleclick.net,"
+        "google-analytics.com,googletagmanager.com,googlesyndication.com,bat.bing.com,connect.facebook.net,"
+        "ads-twitter.com,demdex.net,omtrdc.net",
+    ).split(",")
+    if u.strip()
+]
+# Requests matching these are never blocked: security checks and captchas must render completely
+ALLOWED_URL_PATTERNS = [
+    u.strip().lower()
+    for u in os.getenv("allowed_url_patterns", "/checkpoint/,/challenge,captcha,arkoselabs,funcaptcha").split(",")
+    if u.strip()
+]
 api_token = os.getenv("OPENWEBUI_API_KEY")
 
-USER_NAME = "Manisha Walunj"
+USER_NAME = os.getenv("user_name")  # answers name fields; the resume's first line when unset
 MODEL = "gemma3:12b"
 
-with open("resume.txt", "r", encoding="utf-8") as file:
-    resume_text = file.read()
+ANSWER_CACHE_PATH = os.getenv("answer_cache_path", "answer_cache.db")
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("answer_cache_ttl_seconds", 30 * 24 * 3600))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("answer_cache_max_entries", 5000))
+# By default prompts carry a condensed resume inline; set to true to attach the uploaded file instead
+LLM_ATTACH_RESUME_FILE = os.getenv("llm_attach_resume_file", "false").lower() == "true"
+RESUME_CONTEXT_MAX_CHARS = int(os.getenv("resume_context_max_chars", 1200))
+OPTION_MATCH_THRESHOLD = float(os.getenv("option_match_threshold", 0.7))
+REWORDED_ANSWER_REUSE = os.getenv("reworded_answer_reuse", "true").lower() == "true"
+LABEL_CLASS_THRESHOLD = float(os.getenv("label_class_threshold", 0.9))
+
+# Eligibility facts that a resume rarely states; answered without the LLM when set (e.g. "Yes"/"No")
+WORK_AUTHORIZED = os.getenv("work_authorized")
+REQUIRES_SPONSORSHIP = os.getenv("requires_sponsorship")
+WILLING_TO_RELOCATE = os.getenv("willing_to_relocate")
+NOTICE_PERIOD = os.getenv("notice_period")
+
+RESUME_TEXT_PATH = os.getenv("resume_text_path", "resume.txt")
+
+_resume_text = None
+_resume_hash = None
+
+def get_resume_text():
+    # Read on first use, so subcommands that never look at the resume don't need the file
+    global _resume_text, _resume_hash
+    if _resume_text is None:
+        with open(RESUME_TEXT_PATH, "r", encoding="utf-8") as file:
+            text = file.read()
+        _resume_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        _resume_text = text
+    return _resume_text
+
+def get_resume_hash():
+    get_resume_text()
+    return _resume_hash
+
+_http_session = None
+_llm_executor = None
+
+def get_http_session():
+    # One pooled session for every OpenWebUI call, sized for the LLM worker pool
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(LLM_MAX_CONCURRENCY, 1))
+        _http_session.mount("http://", adapter)
+        _http_session.mount("https://", adapter)
+    return _http_session
+
+def get_llm_executor():
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = ThreadPoolExecutor(max_workers=max(LLM_MAX_CONCURRENCY, 1), thread_name_prefix="llm")
+    return _llm_executor
 
 def upload_resume_get_file_id(RESUME_PATH):
-    # STEP 2: Upload resume and get new file_id (skip if not configured)
+    # STEP 2: Upload resume and get new file_id (skip if not configured).
+    # Uploads are registered by content hash, so an unchanged resume reuses the earlier file id.
     if not OPENWEBUI_API or not api_token:
         return None
     headers = {
@@ -39,68 +177,1269 @@ def upload_resume_get_file_id(RESUME_PATH):
         "Accept": "application/json"
     }
     with open(RESUME_PATH, "rb") as f:
-        files = {"file": f}
-        resp = requests.post(f"{OPENWEBUI_API}/api/v1/files/", headers=headers, files=files, timeout=30)
-        resp.raise_for_status()
-        file_id = resp.json()["id"]
-        print(f"Uploaded resume. File ID: {file_id}")
+        content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    file_id = lookup_uploaded_file(content_hash)
+    if file_id and uploaded_file_exists(file_id, headers):
+        print(f"Reusing uploaded resume. File ID: {file_id}")
         return file_id
+    files = {"file": (os.path.basename(RESUME_PATH), content)}
+    resp = get_http_session().post(f"{OPENWEBUI_API}/api/v1/files/", headers=headers, files=files, timeout=30)
+    resp.raise_for_status()
+    file_id = resp.json()["id"]
+    store_uploaded_file(content_hash, file_id)
+    print(f"Uploaded resume. File ID: {file_id}")
+    return file_id
+
+def uploaded_file_exists(file_id, headers):
+    # Only a 404 means the file is gone; any other failure keeps the id rather than uploading a duplicate
+    try:
+        resp = get_http_session().get(f"{OPENWEBUI_API}/api/v1/files/{file_id}", headers=headers, timeout=10)
+        return resp.status_code != 404
+    except Exception as e:
+        print(f"Could not verify uploaded resume {file_id}: {e}")
+        return True
+
+def lookup_uploaded_file(content_hash):
+    with _answer_cache_lock:
+        row = get_answer_cache().execute(
+            "SELECT file_id FROM uploaded_files WHERE content_hash = ? AND api_url = ?",
+            (content_hash, OPENWEBUI_API),
+        ).fetchone()
+    return row[0] if row else None
+
+def store_uploaded_file(content_hash, file_id):
+    with _answer_cache_lock:
+        conn = get_answer_cache()
+        conn.execute(
+            "INSERT OR REPLACE INTO uploaded_files (content_hash, api_url, file_id, uploaded_at) VALUES (?, ?, ?, ?)",
+            (content_hash, OPENWEBUI_API, file_id, time.time()),
+        )
+        conn.commit()
 
 
 
-def get_answer_from_llm(question, file_id):
-    if not OPENWEBUI_API or not api_token:
-        return ""
+LLM_ANSWER_RULES = (
+    f"If the question asks about years of experience with a specific skill or technology "
+    f"(e.g., Angular, Node.js), extract that number from the resume if clearly present. "
+    f"If not mentioned or unclear, leave the answer completely blank.\n\n"
+
+    f"If the question is about eligibility (Yes/No), answer only 'Yes' or 'No'. "
+    f"If you're unsure, leave the answer blank.\n\n"
+
+    f"If it's a multiple-choice question (radio or checkbox), pick the most relevant option exactly as shown. "
+    f"If not enough information is available, leave it blank.\n\n"
+)
+
+# Amounts may be digit-grouped ("120,000", "12,00,000"), so a trailing "," or "." may still be mid-number
+GROUPED_NUMBER_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+NUMBER_ANSWER_PATTERN = re.compile(r"^\s*(?:[-•]\s*)?\d[\d,]*(?:\.\d+)?(?:[^\d.,]|[.,](?!\d|$))")
+YES_NO_ANSWER_PATTERN = re.compile(r"^\s*(?:[-•]\s*)?(?:yes|no)\b[^\w']", re.IGNORECASE)
+NUMBER_QUESTION_PATTERN = re.compile(r"\bhow many\b|\byears\b|\bnumber of\b|\bsalary\b|\bctc\b|\brate yourself\b|\bscale of\b")
+YES_NO_QUESTION_PATTERN = re.compile(r"^(are|do|does|did|have|has|will|would|can|could|is)\b")
+
+def expected_answer_shape(question):
+    # "number", "yes_no" or None (free text) for a single question
+    lowered = normalize_label(question)
+    if NUMBER_QUESTION_PATTERN.search(lowered):
+        return "number"
+    if YES_NO_QUESTION_PATTERN.search(lowered):
+        return "yes_no"
+    return None
+
+def answer_shape_complete(text, shape):
+    # True once the streamed text already holds a whole answer of the expected shape
+    if shape == "number":
+        return bool(NUMBER_ANSWER_PATTERN.match(text))
+    if shape == "yes_no":
+        return bool(YES_NO_ANSWER_PATTERN.match(text))
+    if shape == "json":
+        if "}" not in text:
+            return False
+        try:
+            parse_json_object(text)
+            return True
+        except ValueError:
+            return False
+    return False
+
+def _read_streamed_completion(response, shape, max_tokens, start, deadline, fields):
+    # Reads OpenAI-style server-sent events ("data: {...}" lines, "data: [DONE]" at the end)
+    parts = []
+    fields["tokens"] = 0
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if time.perf_counter() > deadline:
+            fields["stop"] = "budget"
+            raise TimeoutError(f"LLM answer deadline exceeded after {fields['tokens']} tokens")
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        try:
+            delta = json.loads(data)["choices"][0].get("delta", {}).get("content") or ""
+        except (ValueError, KeyError, IndexError):
+            continue
+        if not delta:
+            continue
+        if not parts:
+            fields["first_token_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        parts.append(delta)
+        fields["tokens"] += 1
+        if answer_shape_complete("".join(parts), shape):
+            fields["stop"] = "shape"
+            break
+        if fields["tokens"] >= max_tokens:
+            # The server was asked for max_tokens too, so this is where its answer ends anyway
+            fields["stop"] = "max_tokens"
+            break
+    return "".join(parts)
+
+def post_chat_completion(content, file_id, shape=None, max_tokens=None, deadline_seconds=None):
+    """
+    Sends one chat completion and returns the answer text. With LLM_STREAMING the response is
+    streamed and cut off as soon as an answer of `shape` ("number", "yes_no", "json") is
+    complete, and ends after `max_tokens` tokens like a non-streamed answer would. Raises
+    TimeoutError when `deadline_seconds` runs out first.
+    """
     chat_headers = {
         "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
+        "Accept": "text/event-stream" if LLM_STREAMING else "application/json",
         "Content-Type": "application/json"
     }
+    max_tokens = max_tokens or LLM_ANSWER_MAX_TOKENS
+    deadline_seconds = deadline_seconds or LLM_ANSWER_DEADLINE_SECONDS
 
     payload = {
         "model": OPENWEBUI_MODEL,
-        "messages": [
-            {
-                "role": "user",
-                "content": (
-                    f"You are a helpful assistant. Answer the following job application question "
-                    f"based only on the resume content in the uploaded file.\n\n"
+        "messages": [{"role": "user", "content": content}],
+        "max_tokens": max_tokens,
+        "stream": LLM_STREAMING,
+    }
+    if file_id:
+        payload["files"] = [{"type": "file", "id": file_id}]
 
-                    f"If the question asks about years of experience with a specific skill or technology "
-                    f"(e.g., Angular, Node.js), extract that number from the resume if clearly present. "
-                    f"If not mentioned or unclear, leave the answer completely blank.\n\n"
+    import requests
 
-                    f"If the question is about eligibility (Yes/No), answer only 'Yes' or 'No'. "
-                    f"If you're unsure, leave the answer blank.\n\n"
+    read_timeout = min(LLM_REQUEST_TIMEOUT, deadline_seconds)
+    start = time.perf_counter()
+    answer = None
+    fields = {}
+    try:
+        with timed_phase("llm call", prompt_chars=len(content)) as fields:
+            try:
+                # The read timeout also catches a model that stalls before or between tokens
+                response = get_http_session().post(
+                    f"{OPENWEBUI_API}/api/chat/completions",
+                    headers=chat_headers,
+                    json=payload,
+                    timeout=(10, read_timeout),
+                    stream=LLM_STREAMING,
+                )
+                try:
+                    fields["http_status"] = response.status_code
+                    response.raise_for_status()
+                    if LLM_STREAMING and response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                        answer = _read_streamed_completion(
+                            response, shape, max_tokens, start, start + deadline_seconds, fields
+                        ).strip()
+                    else:
+                        answer = response.json()['choices'][0]['message']['content'].strip()
+                finally:
+                    # Closing mid-stream drops the connection, which tells the server to stop generating
+                    response.close()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if time.perf_counter() - start < read_timeout:
+                    raise
+                fields["stop"] = "budget"
+                raise TimeoutError(f"LLM answer budget exceeded ({e.__class__.__name__})") from e
+            fields["response_chars"] = len(answer)
+        return answer
+    finally:
+        with _phase_timings_lock:
+            llm_call_stats["calls"] += 1
+            llm_call_stats["errors"] += answer is None
+            llm_call_stats["seconds"] += time.perf_counter() - start
+            llm_call_stats["prompt_chars"] += len(content)
+            llm_call_stats["response_chars"] += len(answer or "")
+            if fields.get("first_token_ms") is not None:
+                llm_call_stats["streamed"] += 1
+                llm_call_stats["first_token_seconds"] += fields["first_token_ms"] / 1000
+            llm_call_stats["early_stops"] += fields.get("stop") == "shape"
+            llm_call_stats["budget_exceeded"] += fields.get("stop") == "budget"
+
+def get_answer_from_llm(question, file_id):
+    if not OPENWEBUI_API or not api_token:
+        return ""
+    shape = expected_answer_shape(question)
+    raw_answer = post_chat_completion(
+        (
+            f"You are a helpful assistant. Answer the following job application question "
+            f"based only on the candidate's resume.\n\n"
+            f"{LLM_ANSWER_RULES}"
+            f"Do not include explanations. If there's no clear answer from the resume, return nothing.\n\n"
+
+            f"{resume_prompt_context(question, file_id)}"
+            f"Question: {question}"
+        ),
+        file_id,
+        shape=shape,
+    )
+    # Clean unwanted characters
+    cleaned = re.sub(r"^\s*(\d+\.)\s+", "", raw_answer)
+    cleaned = re.sub(r"^\s*[-•]\s*", "", cleaned)
+    # A streamed answer stops right after its number or Yes/No; drop what came along with it
+    if re.match(r"\d", cleaned) and shape == "number":
+        # Grouping commas go too: numeric form fields only take digits
+        cleaned = GROUPED_NUMBER_PATTERN.match(cleaned).group(0).rstrip(",").replace(",", "")
+    elif YES_NO_ANSWER_PATTERN.match(cleaned + " ") and shape == "yes_no":
+        cleaned = cleaned.strip(" -•")[:3].strip(" .,;:!").capitalize()
+    # Treat obviously invalid answers as blank; "No" is a real answer to a yes/no question
+    invalid = ["0", "none", "not sure", "n/a", "na", "i don't know", "unknown"] + ([] if shape == "yes_no" else ["no"])
+    if not cleaned or cleaned.strip().lower() in invalid:
+        return ""
+    return cleaned
+
+
+# Option matching: answers are mapped onto the offered options by exact match on normalized text,
+# then numeric ranges ("4" -> "3-5 years"), then a token-set ratio above OPTION_MATCH_THRESHOLD.
+# Decisions are memoized per (label, answer, options), so repeated questions cost a dict lookup.
+OPTION_SYNONYMS = {"y": "yes", "true": "yes", "n": "no", "false": "no", "yrs": "years", "yr": "year"}
+OPTION_FILLER_WORDS = {"a", "an", "the", "of", "in", "i", "am", "have", "my"}
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+_option_decisions = {}
+_option_decisions_lock = threading.Lock()
+
+def normalize_option_text(text):
+    text = (text or "").lower().replace("–", "-").replace("—", "-").replace("’", "'")
+    text = re.sub(r"'s\b", "", text)
+    text = re.sub(r"[^a-z0-9+.\- ]+", " ", text)
+    tokens = [OPTION_SYNONYMS.get(token, token) for token in text.replace("-", " - ").split()]
+    return " ".join(token.strip(".") for token in tokens if token.strip(".") and token != "-")
+
+def parse_numeric_range(text):
+    # (low, high) for options like "3-5 years", "5+ years", "More than 10", "Less than 1 year", "2"
+    lowered = (text or "").lower().replace("–", "-").replace("—", "-")
+    numbers = [float(n) for n in NUMBER_PATTERN.findall(lowered)]
+    if not numbers:
+        return None
+    if len(numbers) >= 2 and re.search(r"\d\s*(-|to)\s*\d", lowered):
+        return numbers[0], numbers[1]
+    if re.search(r"\d\s*\+|more than|over|above|at least|or more|greater", lowered):
+        return numbers[0] + (0.0 if re.search(r"\+|at least|or more", lowered) else 1e-9), float("inf")
+    if re.search(r"less than|under|below|fewer than|up to", lowered):
+        return 0.0, numbers[0] - (0.0 if "up to" in lowered else 1e-9)
+    return numbers[0], numbers[0]
+
+def token_set_ratio(a, b):
+    tokens_a = set(a.split()) - OPTION_FILLER_WORDS or set(a.split())
+    tokens_b = set(b.split()) - OPTION_FILLER_WORDS or set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    common = " ".join(sorted(tokens_a & tokens_b))
+    rest_a = (common + " " + " ".join(sorted(tokens_a - tokens_b))).strip()
+    rest_b = (common + " " + " ".join(sorted(tokens_b - tokens_a))).strip()
+    ratio = lambda x, y: SequenceMatcher(None, x, y).ratio() if x and y else 0.0
+    return max(ratio(common, rest_a), ratio(common, rest_b), ratio(rest_a, rest_b))
+
+def _match_option(answer, options):
+    wanted = normalize_option_text(answer)
+    if not wanted:
+        return None
+    normalized = [normalize_option_text(option) for option in options]
+    for option, text in zip(options, normalized):
+        if text == wanted:
+            return option
+    number = NUMBER_PATTERN.search(answer)
+    ranges = [parse_numeric_range(option) for option in options]
+    # Numeric only when the options themselves are numbers/ranges (one "Other"-style extra allowed)
+    if number and sum(bounds is not None for bounds in ranges) >= max(len(options) - 1, 1):
+        value = float(number.group())
+        for option, bounds in zip(options, ranges):
+            if bounds and bounds[0] <= value <= bounds[1]:
+                return option
+    scored = [(token_set_ratio(wanted, text), option) for option, text in zip(options, normalized) if text]
+    if not scored:
+        return None
+    best_score, best_option = max(scored, key=lambda item: item[0])
+    # Ties between options (e.g. "Yes" vs "Yes, with sponsorship") are not a confident match
+    if best_score >= OPTION_MATCH_THRESHOLD and sum(1 for score, _ in scored if score == best_score) == 1:
+        return best_option
+    return None
+
+def match_option(answer, options, label=""):
+    # Map a free-text answer onto one of the offered options, or None when nothing fits
+    if not answer or not options:
+        return None
+    key = (normalize_label(label) if label else "", answer.strip().lower(), tuple(options))
+    with _option_decisions_lock:
+        if key in _option_decisions:
+            return _option_decisions[key]
+    decision = _match_option(answer, options)
+    with _option_decisions_lock:
+        if len(_option_decisions) >= 4096:
+            _option_decisions.clear()
+        _option_decisions[key] = decision
+    return decision
+
+def resolve_option_answer(label_text, answer, options, kind, file_id):
+    # The answer as one of `options`; when it doesn't fit any, the model is asked once more with the
+    # options spelled out, instead of leaving the field empty and losing the application
+    matched = match_option(answer, options, label_text)
+    if matched is not None:
+        return matched
+    print(f"'{answer}' matches none of {options}; asking again with the options listed.")
+    try:
+        retry = get_answers_from_llm_batch(
+            [{"question": label_text, "type": kind, "options": options}], file_id
+        ).get(label_text)
+    except Exception as e:
+        print(f"Option retry failed for '{label_text}': {e}")
+        return None
+    if retry:
+        store_cached_answer(label_text, retry)
+    return retry
+
+def parse_json_object(raw_text):
+    # Models like to wrap JSON in ```json fences or add a sentence before it
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw_text.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object in LLM response")
+    parsed = json.loads(text[start:end + 1])
+    if not isinstance(parsed, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return parsed
+
+def get_answers_from_llm_batch(questions, file_id):
+    """
+    Answer every question of a modal step with a single completion.
+    `questions` is a list of {"question", "type", "options"} dicts; returns {question: answer}
+    for the answers that parsed and validated. Questions missing from the result should be
+    retried one by one by the caller. Raises ValueError when the response isn't usable JSON.
+    """
+    if not OPENWEBUI_API or not api_token or not questions:
+        return {}
+    numbered = []
+    for idx, spec in enumerate(questions, start=1):
+        line = f'{idx}. [{spec.get("type") or "text"}] {spec["question"]}'
+        if spec.get("options"):
+            line += " Options: " + " | ".join(spec["options"])
+        numbered.append(line)
+    raw = post_chat_completion(
+        (
+            f"You are a helpful assistant. Answer each of the following job application questions "
+            f"based only on the candidate's resume.\n\n"
+            f"{LLM_ANSWER_RULES}"
+            f"For select, radio and checkbox questions the answer must be one of the listed options, copied exactly.\n\n"
+            f"Reply with only a JSON object that maps each question number (as a string) to its answer string. "
+            f"Use an empty string when there's no clear answer from the resume. No explanations.\n\n"
+
+            f"{resume_prompt_context(' '.join(spec['question'] for spec in questions), file_id, 2 * RESUME_CONTEXT_MAX_CHARS)}"
+            f"Questions:\n" + "\n".join(numbered)
+        ),
+        file_id,
+        shape="json",
+        max_tokens=32 + LLM_ANSWER_MAX_TOKENS * len(questions),
+        deadline_seconds=2 * LLM_ANSWER_DEADLINE_SECONDS,
+    )
+    parsed = parse_json_object(raw)
 
-                    f"If it's a multiple-choice question (radio or checkbox), pick the most relevant option exactly as shown. "
-                    f"If not enough information is available, leave it blank.\n\n"
+    answers = {}
+    for idx, spec in enumerate(questions, start=1):
+        value = parsed.get(str(idx), parsed.get(spec["question"]))
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            continue
+        value = str(value).strip()
+        if not value or value.lower() in ["none", "not sure", "n/a", "na", "i don't know", "unknown"]:
+            continue
+        if spec.get("options"):
+            value = match_option(value, spec["options"])
+            if value is None:
+                continue
+        answers[spec["question"]] = value
+    return answers
+
+
+# Resume fact index: built on first use from resume.txt so that deterministic questions
+# (contact details, years with a skill, eligibility) never reach the LLM.
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+DATE_RANGE_PATTERN = re.compile(
+    r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{4})\s*[–—-]+\s*"
+    r"(?:(present|current|now)|(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{4}))",
+    re.IGNORECASE,
+)
+
+def _resume_sections(text):
+    sections = {}
+    current = "HEADER"
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and stripped.upper() == stripped and re.search(r"[A-Z]{3,}", stripped) and len(stripped) < 60:
+            current = stripped
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(stripped)
+    return sections
+
+def _months_between(start, end):
+    return max((end[0] - start[0]) * 12 + (end[1] - start[1]), 0)
+
+def _experience_blocks(lines, today):
+    # Each dated line starts a block; the line just above it is the role title
+    dated = []
+    for idx, line in enumerate(lines):
+        match = DATE_RANGE_PATTERN.search(line)
+        if match:
+            start = (int(match.group(2)), MONTHS[match.group(1).lower()[:3]])
+            end = today if match.group(3) else (int(match.group(5)), MONTHS[match.group(4).lower()[:3]])
+            dated.append((idx, start, end))
+    blocks = []
+    for n, (idx, start, end) in enumerate(dated):
+        first = idx - 1 if idx > 0 else idx
+        last = dated[n + 1][0] - 1 if n + 1 < len(dated) else len(lines)
+        blocks.append((start, end, "\n".join(lines[first:last])))
+    return blocks
+
+def _total_months(intervals):
+    # Merge overlapping roles so concurrent internships aren't double counted
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += _months_between(current_start, current_end)
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += _months_between(current_start, current_end)
+    return total
+
+def _months_to_years(months):
+    return str(max(1, round(months / 12))) if months > 0 else None
+
+def build_resume_fact_index(text):
+    today = time.localtime()
+    today = (today.tm_year, today.tm_mon)
+    sections = _resume_sections(text)
+
+    facts = {"contact": {}, "skills": {}, "eligibility": {}}
+    name = USER_NAME or next((line for line in text.splitlines() if line.strip()), "").strip().title()
+    if name:
+        facts["contact"]["full name"] = name
+        parts = name.split()
+        facts["contact"]["first name"] = parts[0]
+        if len(parts) > 1:
+            facts["contact"]["last name"] = parts[-1]
+    email = re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", text)
+    if email:
+        facts["contact"]["email"] = email.group(0)
+    phone = re.search(r"(\+\d{1,3}[\s-]?)?\d[\d\s-]{8,}\d", text)
+    if phone:
+        facts["contact"]["phone"] = re.sub(r"[^\d]", "", phone.group(0))[-10:]
+    for line in text.splitlines()[:5]:
+        line = line.strip()
+        if "," in line and not re.search(r"@|\+\d", line):
+            facts["contact"]["city"] = line.split(",")[0].strip()
+            break
+    gpa = re.search(r"\b(?:cgpa|gpa)\s*[:\-]?\s*(\d+(?:\.\d+)?)", text, re.IGNORECASE)
+    if gpa:
+        facts["contact"]["gpa"] = gpa.group(1)
+    notice = re.search(r"notice period\s*[:\-]\s*(.+)", text, re.IGNORECASE)
+    if NOTICE_PERIOD or notice:
+        facts["contact"]["notice period"] = NOTICE_PERIOD or notice.group(1).strip()
+
+    skill_names = set()
+    for heading, lines in sections.items():
+        for line in lines:
+            if ":" not in line:
+                continue
+            category, values = line.split(":", 1)
+            if "SKILL" in heading or category.strip().lower() == "tools":
+                if re.search(r"soft|multilingual", category.lower()):
+                    continue
+                for skill in values.split(","):
+                    skill = re.sub(r"\(.*?\)", "", skill).strip()
+                    if skill and len(skill) <= 40:
+                        skill_names.add(skill)
+
+    blocks = []
+    for heading, lines in sections.items():
+        if "EXPERIENCE" in heading:
+            blocks.extend(_experience_blocks(lines, today))
+    for skill in skill_names:
+        pattern = re.compile(r"(?<![\w+#])" + re.escape(skill.lower()) + r"(?![\w+#])")
+        intervals = [(start, end) for start, end, block in blocks if pattern.search(block.lower())]
+        facts["skills"][skill.lower()] = {"name": skill, "years": _months_to_years(_total_months(intervals))}
+    facts["total_years"] = _months_to_years(_total_months([(start, end) for start, end, _ in blocks]))
+
+    education = "\n".join(sections.get("EDUCATION", [])).lower()
+    facts["eligibility"]["bachelor"] = "Yes" if re.search(r"bachelor|b\.?\s?e\b|b\.?\s?tech", education) else None
+    facts["eligibility"]["master"] = "Yes" if re.search(r"master|m\.?\s?tech|m\.?\s?s\b|mba", education) else None
+    facts["eligibility"]["authorized"] = WORK_AUTHORIZED
+    facts["eligibility"]["sponsorship"] = REQUIRES_SPONSORSHIP
+    facts["eligibility"]["relocate"] = WILLING_TO_RELOCATE
+
+    # Longest names first so "node.js" wins over "node" and "scikit-learn" over "scikit"
+    names = sorted(facts["skills"], key=len, reverse=True)
+    facts["skill_pattern"] = re.compile(
+        r"(?<![\w+#])(" + "|".join(re.escape(n) for n in names) + r")(?![\w+#])"
+    ) if names else None
+    return facts
+
+def _find_skill(facts, lowered):
+    if not facts["skill_pattern"]:
+        return None
+    found = {m.group(1) for m in facts["skill_pattern"].finditer(lowered)}
+    # Ambiguous ("Python or Java?") questions go to the LLM
+    return facts["skills"][found.pop()] if len(found) == 1 else None
 
-                    f"Do not include explanations. If there's no clear answer from the resume, return nothing.\n\n"
+def _skill_years(facts, lowered):
+    if not re.search(r"\bexperience\b|\bworked\b|\bused\b|\bworking\b", lowered):
+        return None
+    if facts["skill_pattern"] and facts["skill_pattern"].search(lowered):
+        skill = _find_skill(facts, lowered)
+        return skill["years"] if skill else None
+    if re.search(r"\b(total|overall)\b", lowered) or re.fullmatch(
+            r"how many years of (work |professional )?experience do you (currently )?have", lowered):
+        return facts["total_years"]
+    return None
+
+def _has_skill(facts, lowered):
+    skill = _find_skill(facts, lowered)
+    return "Yes" if skill else None
+
+FACT_RULES = [
+    (re.compile(r"\bsponsor"), lambda f, q: f["eligibility"]["sponsorship"]),
+    (re.compile(r"\b(authori[sz]ed|legally (?:able|eligible)|right to work|work permit)\b"),
+     lambda f, q: f["eligibility"]["authorized"]),
+    (re.compile(r"\breloca"), lambda f, q: f["eligibility"]["relocate"]),
+    (re.compile(r"\bnotice period\b|\bhow soon can you (?:start|join)\b"), lambda f, q: f["contact"].get("notice period")),
+    (re.compile(r"\bhow many years\b|\byears of\b.*\bexperience\b|\bexperience\b.*\byears\b"), _skill_years),
+    (re.compile(r"\b(phone|mobile)( number)?$"), lambda f, q: f["contact"].get("phone")),
+    (re.compile(r"\be-?mail\b"), lambda f, q: f["contact"].get("email")),
+    (re.compile(r"\bfirst name\b"), lambda f, q: f["contact"].get("first name")),
+    (re.compile(r"\blast name\b|\bsurname\b"), lambda f, q: f["contact"].get("last name")),
+    (re.compile(r"^(full )?name$"), lambda f, q: f["contact"].get("full name")),
+    (re.compile(r"^(current )?(city|location)\b.{0,20}$"), lambda f, q: f["contact"].get("city")),
+    (re.compile(r"\b(c?gpa|grade point)\b"), lambda f, q: f["contact"].get("gpa")),
+    (re.compile(r"\bbachelor"), lambda f, q: f["eligibility"]["bachelor"]),
+    (re.compile(r"\bmaster"), lambda f, q: f["eligibility"]["master"]),
+    (re.compile(r"^(do|have|are) you\b.*\b(experience|familiar|worked|proficient|knowledge)\b"), _has_skill),
+]
+
+_resume_facts = None
+
+def get_resume_facts():
+    global _resume_facts
+    if _resume_facts is None:
+        _resume_facts = build_resume_fact_index(get_resume_text())
+    return _resume_facts
+
+resume_fact_stats = {"hits": 0}
+
+def answer_from_resume_facts(question, options=None):
+    # Returns an answer only when the index is confident; None sends the question on to the cache/LLM
+    lowered = normalize_label(question)
+    for pattern, resolve in FACT_RULES:
+        if pattern.search(lowered):
+            answer = resolve(get_resume_facts(), lowered)
+            if answer and options:
+                answer = match_option(answer, options)
+            if answer:
+                resume_fact_stats["hits"] += 1
+                print(f"Answered from resume facts: {question} = {answer}")
+                return answer
+            return None
+    return None
+
+
+# Answer cache: question -> answer, persisted in SQLite so it survives between runs.
+# Entries are keyed on the normalized label, the resume hash and the model name,
+# so editing resume.txt or switching model never serves stale answers.
+_answer_cache_conn = None
+_answer_cache_lock = threading.Lock()
+answer_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "reworded_hits": 0}
+
+def normalize_label(label_text):
+    text = label_text.lower().strip()
+    text = re.sub(r"[*?:.!]+$", "", text)
+    text = re.sub(r"\s*\brequired\b\s*$", "", text)
+    text = re.sub(r"[^a-z0-9+#./\- ]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def get_answer_cache():
+    global _answer_cache_conn
+    if _answer_cache_conn is None:
+        _answer_cache_conn = sqlite3.connect(ANSWER_CACHE_PATH, check_same_thread=False)
+        _answer_cache_conn.execute("""
+            CREATE TABLE IF NOT EXISTS answer_cache (
+                label TEXT NOT NULL,
+                resume_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (label, resume_hash, model)
+            )
+        """)
+        _answer_cache_conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_answer_cache_last_used ON answer_cache (last_used)"
+        )
+        _answer_cache_conn.execute("""
+            CREATE TABLE IF NOT EXISTS uploaded_files (
+                content_hash TEXT NOT NULL,
+                api_url TEXT NOT NULL,
+                file_id TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, api_url)
+            )
+        """)
+        _answer_cache_conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_summaries (
+                resume_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (resume_hash, model)
+            )
+        """)
+        _answer_cache_conn.commit()
+    return _answer_cache_conn
+
+def lookup_cached_answer(label_text, options=None):
+    # Exact label first, then the answer to an earlier wording of the question (see find_reworded_answer)
+    key = (normalize_label(label_text), get_resume_hash(), OPENWEBUI_MODEL)
+    now = time.time()
+    with _answer_cache_lock:
+        conn = get_answer_cache()
+        row = conn.execute(
+            "SELECT answer, created_at FROM answer_cache WHERE label = ? AND resume_hash = ? AND model = ?",
+            key,
+        ).fetchone()
+        if row and now - row[1] <= ANSWER_CACHE_TTL_SECONDS:
+            conn.execute(
+                "UPDATE answer_cache SET last_used = ? WHERE label = ? AND resume_hash = ? AND model = ?",
+                (now, *key),
+            )
+            conn.commit()
+            answer_cache_stats["hits"] += 1
+            emit_metric("answer_cache", hit=True, label=label_text[:120])
+            return row[0]
+        if row:
+            conn.execute(
+                "DELETE FROM answer_cache WHERE label = ? AND resume_hash = ? AND model = ?", key
+            )
+            conn.commit()
+            answer_cache_stats["evictions"] += 1
+    reworded = find_reworded_answer(label_text, options)
+    if reworded:
+        matched_label, answer = reworded
+        print(f"Reusing the answer to '{matched_label}' for: {label_text}")
+        answer_cache_stats["hits"] += 1
+        answer_cache_stats["reworded_hits"] += 1
+        emit_metric("answer_cache", hit=True, reworded=True, label=label_text[:120])
+        store_cached_answer(label_text, answer)
+        return answer
+    answer_cache_stats["misses"] += 1
+    emit_metric("answer_cache", hit=False, label=label_text[:120])
+    return None
+
+def store_cached_answer(label_text, answer):
+    # Blank answers are never cached: they abort the application and should be retried next time.
+    if not answer:
+        return
+    now = time.time()
+    with _answer_cache_lock:
+        conn = get_answer_cache()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO answer_cache (label, resume_hash, model, answer, created_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (normalize_label(label_text), get_resume_hash(), OPENWEBUI_MODEL, answer, now, now),
+        )
+        # LRU eviction once the table grows past the configured size
+        cursor = conn.execute(
+            """
+            DELETE FROM answer_cache WHERE rowid IN (
+                SELECT rowid FROM answer_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (ANSWER_CACHE_MAX_ENTRIES,),
+        )
+        answer_cache_stats["evictions"] += max(cursor.rowcount, 0)
+        conn.commit()
+    add_to_reworded_index(label_text, answer)
+
+# Reworded-question reuse: a question is reduced to its expected answer shape and its salient
+# words (stemmed, filler words dropped, numbers kept), and an earlier answer is reused only when
+# both are the same, so "Years of Python experience" reuses the answer to "How many years of
+# experience do you have with Python?" while "Java Spring", "GitHub" or "3 days" never borrow
+# the answer for "Java", "LinkedIn" or "5 days".
+_reworded_index = None  # (shape, salient words) -> (label, answer)
+_reworded_labels = set()  # every label in the index
+_reworded_index_lock = threading.Lock()
+
+def stem_word(word):
+    # Just enough stemming that inflections of one word agree: relocate/relocating/relocated
+    for suffix in ("ies", "ied", "ing", "ed", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            word = word[:-len(suffix)] + ("y" if suffix in ("ies", "ied") else "")
+            if suffix in ("ing", "ed") and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]  # planning -> plan
+            break
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+QUESTION_FILLER_WORDS = {stem_word(word) for word in """
+how many much what which is are am was do does did have has had you your of in on with for to the
+an and or this that at as by be been any total overall year yr experience work professional
+relevant hand please enter provide select level hold possess kind type would
+will can could if me my we our us role position job company here there time long so far about
+open able willing comfortable ready
+""".split()}
+
+def label_words(label_text):
+    words = re.findall(r"[a-z0-9+#]+", normalize_label(label_text))
+    return [stem_word(word) for word in words if len(word) > 1 or word.isdigit()]
+
+def salient_words(words):
+    return frozenset(word for word in words if word not in QUESTION_FILLER_WORDS)
+
+def reworded_key(label_text):
+    return expected_answer_shape(label_text), salient_words(label_words(label_text))
+
+def _index_answer(index, label_text, answer):
+    label = normalize_label(label_text)
+    index[reworded_key(label)] = (label, answer)
+    _reworded_labels.add(label)
+
+def get_reworded_index():
+    global _reworded_index
+    with _reworded_index_lock:
+        if _reworded_index is None:
+            with _answer_cache_lock:
+                rows = get_answer_cache().execute(
+                    "SELECT label, answer FROM answer_cache WHERE resume_hash = ? AND model = ? AND created_at >= ?",
+                    (get_resume_hash(), OPENWEBUI_MODEL, time.time() - ANSWER_CACHE_TTL_SECONDS),
+                ).fetchall()
+            index = {}
+            for label, answer in rows:
+                _index_answer(index, label, answer)
+            _reworded_index = index
+        return _reworded_index
+
+def add_to_reworded_index(label_text, answer):
+    # Before the first lookup the index doesn't exist yet and will load this row from the cache
+    with _reworded_index_lock:
+        if _reworded_index is not None and answer:
+            _index_answer(_reworded_index, label_text, answer)
+
+def find_reworded_answer(label_text, options=None):
+    # (earlier label, answer) for an earlier wording of the same question, else None
+    if not REWORDED_ANSWER_REUSE:
+        return None
+    shape, salient = reworded_key(label_text)
+    if not salient:
+        return None  # nothing but filler words: too vague to match anything
+    index = get_reworded_index()
+    with _reworded_index_lock:
+        entry = index.get((shape, salient))
+    if entry is None:
+        return None
+    label, answer = entry
+    if options:
+        answer = match_option(answer, options)
+        if answer is None:
+            return None
+    return label, answer
+
+# Label classification: modal labels are questions, option captions or page chrome (buttons,
+# progress, upload hints). A label is skipped only when it is (nearly) word for word one of the
+# prototypes below; anything else stays a question, so "Degree" or "Back-end experience" is never
+# mistaken for the "Bachelor's degree" option or the "Back" button.
+LABEL_PROTOTYPES = {
+    "noise": [
+        "Submit application", "Next", "Review", "Review your application", "Done", "Back", "View",
+        "Learn more", "Show more", "Dismiss", "Continue applying", "Upload resume", "Upload cover letter",
+        "Upload CV", "Resume", "Cover letter", "Be sure to include an updated resume", "DOC, DOCX, PDF (2 MB)",
+        "Dialog content start", "Powered by LinkedIn", "Help Center",
+        "Application settings", "Download", "Deselect resume", "Contact info", "Additional questions",
+        "Your application was sent", "Job search safety reminder",
+    ],
+    "option": [
+        "Yes", "No", "None", "Other", "Prefer not to say", "I don't wish to answer", "Decline to self identify",
+        "Male", "Female", "Non-binary", "High school", "Bachelor's degree", "Master's degree", "Doctorate",
+        "Native or bilingual", "Professional working proficiency", "Beginner", "Intermediate", "Advanced",
+        "Expert", "Less than 1 year", "1-2 years", "3-5 years", "Immediately", "Select an option",
+    ],
+}
+_label_prototype_keys = None
+_label_classes = {}
+_label_classes_lock = threading.Lock()
+
+def label_key(label_text):
+    return " ".join(label_words(label_text))
+
+def classify_label(label_text):
+    # "question", "option" or "noise"; memoized because the same labels recur on every job
+    lowered = normalize_label(label_text)
+    with _label_classes_lock:
+        if lowered in _label_classes:
+            return _label_classes[lowered]
+    global _label_prototype_keys
+    if _label_prototype_keys is None:
+        _label_prototype_keys = {
+            label_key(text): label_class for label_class, texts in LABEL_PROTOTYPES.items() for text in texts
+        }
+    key = label_key(label_text)
+    progress = r"\s*\d{1,3}\s*%\s*|step \d+ of \d+|last used on [\d/]+"
+    if not lowered or re.fullmatch(progress, label_text.strip().lower()):
+        label_class = "noise"
+    elif "?" in label_text or lowered in _reworded_labels:
+        label_class = "question"  # asks something, or was answered before
+    elif key in _label_prototype_keys:
+        label_class = _label_prototype_keys[key]
+    else:
+        # Near-exact only (a typo or an extra character), never a shared word
+        label_class = "question"
+        best = 0.0
+        for prototype_key, prototype_class in _label_prototype_keys.items():
+            similarity = SequenceMatcher(None, key, prototype_key).ratio()
+            if similarity >= LABEL_CLASS_THRESHOLD and similarity > best:
+                label_class, best = prototype_class, similarity
+    with _label_classes_lock:
+        _label_classes[lowered] = label_class
+    return label_class
+
+def get_cached_answer_from_llm(question, file_id):
+    fact = answer_from_resume_facts(question)
+    if fact:
+        return fact
+    cached = lookup_cached_answer(question)
+    if cached is not None:
+        print(f"Answer cache hit for: {question}")
+        return cached
+    try:
+        answer = get_answer_from_llm(question, file_id)
+    except TimeoutError as e:
+        # A budget overrun says nothing about the question, so the fallback is not cached
+        print(f"{e} for '{question}'; using the fallback answer.")
+        return LLM_FALLBACK_ANSWER
+    store_cached_answer(question, answer.strip())
+    return answer
+
+def resolve_answers_concurrently(questions, file_id):
+    # Ask the LLM about every question of a modal step at once; bounded by LLM_MAX_CONCURRENCY.
+    # Only network work runs in the pool — the Playwright page is never touched off the main thread.
+    unique_questions = {}
+    for question in questions:
+        unique_questions.setdefault(normalize_label(question), question)
+    if not unique_questions:
+        return {}
+
+    def ask(question):
+        try:
+            return get_cached_answer_from_llm(question, file_id).strip()
+        except Exception as e:
+            print(f"LLM request failed for '{question}': {e}")
+            return ""
+
+    executor = get_llm_executor()
+    futures = {key: executor.submit(ask, question) for key, question in unique_questions.items()}
+    answers_by_key = {key: future.result() for key, future in futures.items()}
+    return {question: answers_by_key[normalize_label(question)] for question in questions}
+
+def resolve_step_answers(question_specs, file_id):
+    # Resume facts and cache first, then one batched completion for the rest, then per-question calls for whatever
+    # the batch couldn't answer (unparseable JSON, invalid option, or a blank).
+    answers = {}
+    remaining = []
+    for spec in question_specs:
+        fact = answer_from_resume_facts(spec["question"], spec.get("options"))
+        if fact:
+            answers[spec["question"]] = fact
+            continue
+        cached = lookup_cached_answer(spec["question"], spec.get("options"))
+        if cached is not None:
+            answers[spec["question"]] = cached
+        else:
+            remaining.append(spec)
+    if not remaining:
+        return answers
 
-                    f"Resume:\n{resume_text}\n\n"
-                    f"Question: {question}"
+    if LLM_BATCH_QUESTIONS and len(remaining) > 1:
+        try:
+            batch_answers = get_answers_from_llm_batch(remaining, file_id)
+            print(f"Batch LLM call answered {len(batch_answers)}/{len(remaining)} questions.")
+            for question, answer in batch_answers.items():
+                store_cached_answer(question, answer)
+            answers.update(batch_answers)
+            remaining = [spec for spec in remaining if spec["question"] not in batch_answers]
+        except Exception as e:
+            print(f"Batch LLM call failed, falling back to per-question calls: {e}")
+
+    if remaining:
+        answers.update(resolve_answers_concurrently([spec["question"] for spec in remaining], file_id))
+    return answers
+
+# Resume context: instead of the whole resume (and the attached file on top of it), each prompt
+# carries a compact summary generated once per resume hash plus only the sections that match
+# the question's topic, within RESUME_CONTEXT_MAX_CHARS.
+RESUME_TOPICS = [
+    (re.compile(r"educat|degree|universit|college|school|gpa|cgpa|graduat|bachelor|master"), "EDUCATION"),
+    (re.compile(r"experience|years|worked|employ|intern|role|responsib|company"), "EXPERIENCE"),
+    (re.compile(r"skill|proficien|familiar|knowledge|tool|language|framework|technolog|rate yourself"), "SKILLS"),
+    (re.compile(r"project|built|portfolio|github"), "PROJECTS"),
+    (re.compile(r"certif|course|training"), "CERTIF"),
+    (re.compile(r"name|phone|email|address|city|location|linkedin"), "HEADER"),
+]
+_resume_summary = None
+_resume_summary_lock = threading.Lock()
+_resume_section_index = None
+
+def get_resume_section_index():
+    # (name, text, token set) per non-empty section, built on first use
+    global _resume_section_index
+    if _resume_section_index is None:
+        index = []
+        for name, lines in _resume_sections(get_resume_text()).items():
+            body = "\n".join(line for line in lines if line).strip()
+            if body:
+                index.append((name, body, set(tokenize(name + " " + body))))
+        _resume_section_index = index
+    return _resume_section_index
+
+def get_resume_summary():
+    global _resume_summary
+    with _resume_summary_lock:
+        if _resume_summary is not None:
+            return _resume_summary
+        with _answer_cache_lock:
+            row = get_answer_cache().execute(
+                "SELECT summary FROM resume_summaries WHERE resume_hash = ? AND model = ?",
+                (get_resume_hash(), OPENWEBUI_MODEL),
+            ).fetchone()
+        if row:
+            _resume_summary = row[0]
+            return _resume_summary
+        summary = ""
+        if OPENWEBUI_API and api_token:
+            try:
+                with timed_phase("resume summary"):
+                    summary = post_chat_completion(
+                        "Summarize this resume for a recruiter in at most 80 words: name, location, total "
+                        "experience, current or latest role, main skills and highest education. "
+                        "Plain text, no headings.\n\n" + get_resume_text(),
+                        None,
+                        max_tokens=256,
+                        deadline_seconds=LLM_REQUEST_TIMEOUT,
+                    )
+            except Exception as e:
+                print(f"Resume summary failed, using the profile section instead: {e}")
+        if summary:
+            with _answer_cache_lock:
+                conn = get_answer_cache()
+                conn.execute(
+                    "INSERT OR REPLACE INTO resume_summaries (resume_hash, model, summary, created_at) VALUES (?, ?, ?, ?)",
+                    (get_resume_hash(), OPENWEBUI_MODEL, summary, time.time()),
                 )
-            }
-        ],
-        "files": [{"type": "file", "id": file_id}]
+                conn.commit()
+        else:
+            # Not cached, so the next run tries the model again
+            summary = next(
+                (body for name, body, _ in get_resume_section_index() if "SUMMARY" in name or "PROFILE" in name),
+                get_resume_text()[:400],
+            )[:600]
+        _resume_summary = summary
+        return _resume_summary
+
+def condensed_resume_context(topic_text, max_chars=None):
+    max_chars = RESUME_CONTEXT_MAX_CHARS if max_chars is None else max_chars
+    lowered = topic_text.lower()
+    wanted_topics = {topic for pattern, topic in RESUME_TOPICS if pattern.search(lowered)}
+    question_tokens = set(tokenize(topic_text))
+    scored = []
+    for position, (name, body, tokens) in enumerate(get_resume_section_index()):
+        topic_match = any(topic in name or (topic == "HEADER" and position == 0) for topic in wanted_topics)
+        score = 3 * topic_match + len(question_tokens & tokens)
+        if score:
+            scored.append((score, -position, name, body))
+    parts = [f"Resume summary:\n{get_resume_summary()}"]
+    used = len(parts[0])
+    for _, _, name, body in sorted(scored, reverse=True):
+        if used + len(body) > max_chars and len(parts) > 1:
+            break
+        section = f"{name}:\n{body[:max(max_chars - used, 200)]}"
+        parts.append(section)
+        used += len(section)
+    return "\n\n".join(parts)
+
+def resume_prompt_context(topic_text, file_id, max_chars=None):
+    # With the file attached the model already has the resume, so it is never inlined as well
+    if file_id:
+        return "The candidate's resume is in the uploaded file.\n\n"
+    return condensed_resume_context(topic_text, max_chars) + "\n\n"
+
+def print_answer_cache_stats():
+    total = answer_cache_stats["hits"] + answer_cache_stats["misses"]
+    hit_rate = (answer_cache_stats["hits"] / total * 100) if total else 0.0
+    print(
+        f"Answer cache: {answer_cache_stats['hits']} hits, {answer_cache_stats['misses']} misses "
+        f"({hit_rate:.1f}% hit rate, {answer_cache_stats['reworded_hits']} from reworded questions), "
+        f"{answer_cache_stats['evictions']} evictions; "
+        f"{resume_fact_stats['hits']} answered from resume facts"
+    )
+
+
+# Pacing: DOM-state waits decide when the page is ready; a separate jitter schedule decides when
+# the next human-visible action (a click that LinkedIn sees) may happen. The schedule is a
+# deadline rather than a sleep, so LLM calls and DOM parsing run while it counts down.
+_phase_timings_lock = threading.Lock()
+phase_timings = {}
+
+MODAL_SIGNATURE_JS = """() => {
+    const modal = document.querySelector('div.jobs-easy-apply-modal');
+    return modal ? (modal.innerText || '').slice(0, 2000) : null;
+}"""
+
+# Instrumentation: every timed_phase feeds the end-of-run summary table and, when METRICS_PATH is
+# set, is also written as one JSON line tagged with the run and the job being worked on, next to
+# outcome, LLM and answer-cache events. METRICS_PORT serves the aggregates in Prometheus format.
+RUN_ID = time.strftime("%Y%m%dT%H%M%S")
+_metrics_context = threading.local()
+_metrics_file_lock = threading.Lock()
+_metrics_file = None
+outcome_counts = {}
+llm_call_stats = {
+    "calls": 0, "errors": 0, "seconds": 0.0, "prompt_chars": 0, "response_chars": 0,
+    "streamed": 0, "first_token_seconds": 0.0, "early_stops": 0, "budget_exceeded": 0,
+}
+
+def emit_metric(event_type, **fields):
+    global _metrics_file
+    if not METRICS_PATH:
+        return
+    record = {
+        "type": event_type,
+        "run_id": RUN_ID,
+        "profile": PROFILE_NAME,
+        "ts": round(time.time(), 3),
+        "job": getattr(_metrics_context, "job_key", None),
+        **fields,
     }
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    with _metrics_file_lock:
+        if _metrics_file is None:
+            _metrics_file = open(METRICS_PATH, "a", encoding="utf-8", buffering=1)
+        _metrics_file.write(line)
+
+@contextmanager
+def job_metrics_context(job_key):
+    # Tags every metric emitted on this thread with the job being processed
+    previous = getattr(_metrics_context, "job_key", None)
+    _metrics_context.job_key = job_key
+    try:
+        yield
+    finally:
+        _metrics_context.job_key = previous
+
+@contextmanager
+def timed_phase(name, **fields):
+    # Yields `fields` so the timed block can attach details (sizes, flags) to its event
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        elapsed = time.perf_counter() - start
+        with _phase_timings_lock:
+            entry = phase_timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+        emit_metric("phase", phase=name, seconds=round(elapsed, 4), **fields)
+
+def count_outcome(outcome, reason=None, **fields):
+    # outcome is one of applied / discarded / skipped / errored
+    with _phase_timings_lock:
+        outcome_counts[outcome] = outcome_counts.get(outcome, 0) + 1
+    emit_metric("outcome", outcome=outcome, reason=reason, **fields)
+
+def print_phase_timing_report():
+    with _phase_timings_lock:
+        rows = sorted(phase_timings.items(), key=lambda item: item[1]["total"], reverse=True)
+    if not rows:
+        return
+    print("\nPhase timing report (phases nest, so totals overlap):")
+    print(f"{'phase':<24}{'count':>7}{'total s':>10}{'avg s':>9}{'max s':>9}")
+    for name, entry in rows:
+        print(
+            f"{name:<24}{entry['count']:>7}{entry['total']:>10.1f}"
+            f"{entry['total'] / entry['count']:>9.2f}{entry['max']:>9.2f}"
+        )
 
-    response = requests.post(
-        f"{OPENWEBUI_API}/api/chat/completions",
-        headers=chat_headers,
-        json=payload,
+def print_run_summary():
+    global _metrics_file
+    print_phase_timing_report()
+    with _phase_timings_lock:
+        outcomes = dict(outcome_counts)
+        llm = dict(llm_call_stats)
+        phases = {name: dict(entry) for name, entry in phase_timings.items()}
+    print("Outcomes: " + (", ".join(f"{name} {count}" for name, count in sorted(outcomes.items())) or "none"))
+    if llm["calls"]:
+        print(
+            f"LLM: {llm['calls']} calls ({llm['errors']} failed), "
+            f"{llm['seconds'] / llm['calls']:.2f}s avg latency, "
+            f"{llm['prompt_chars'] // llm['calls']} avg prompt chars"
+        )
+    if llm["streamed"]:
+        print(
+            f"LLM streaming: {llm['first_token_seconds'] / llm['streamed']:.2f}s avg time to first token, "
+            f"{llm['early_stops']} stopped early, {llm['budget_exceeded']} over budget"
+        )
+    with _network_stats_lock:
+        network = {**network_stats, "blocked": dict(network_stats["blocked"])}
+    blocked = ", ".join(f"{reason} {count}" for reason, count in sorted(network["blocked"].items()))
+    print(
+        f"Network: {network['requests']} responses, {network['bytes'] / 1e6:.1f} MB downloaded; "
+        f"{sum(network['blocked'].values())} requests blocked ({blocked or 'none'})"
     )
-    response.raise_for_status()
+    emit_metric(
+        "summary", outcomes=outcomes, llm=llm, phases=phases, network=network,
+        answer_cache=dict(answer_cache_stats), resume_fact_hits=resume_fact_stats["hits"],
+    )
+    with _metrics_file_lock:
+        if _metrics_file is not None:
+            _metrics_file.close()
+            _metrics_file = None
+            print(f"Run metrics written to {METRICS_PATH}.")
+
+def render_prometheus_metrics():
+    with _phase_timings_lock:
+        phases = sorted(phase_timings.items())
+        outcomes = sorted(outcome_counts.items())
+        llm = dict(llm_call_stats)
+    with _network_stats_lock:
+        network = {**network_stats, "blocked": sorted(network_stats["blocked"].items())}
+    lines = [
+        "# TYPE linkedin_phase_seconds_total counter",
+        *(f'linkedin_phase_seconds_total{{phase="{name}"}} {entry["total"]:.4f}' for name, entry in phases),
+        "# TYPE linkedin_phase_count_total counter",
+        *(f'linkedin_phase_count_total{{phase="{name}"}} {entry["count"]}' for name, entry in phases),
+        "# TYPE linkedin_jobs_total counter",
+        *(f'linkedin_jobs_total{{outcome="{name}"}} {count}' for name, count in outcomes),
+        "# TYPE linkedin_llm_calls_total counter",
+        f"linkedin_llm_calls_total {llm['calls']}",
+        "# TYPE linkedin_llm_errors_total counter",
+        f"linkedin_llm_errors_total {llm['errors']}",
+        "# TYPE linkedin_llm_seconds_total counter",
+        f"linkedin_llm_seconds_total {llm['seconds']:.4f}",
+        "# TYPE linkedin_llm_first_token_seconds_total counter",
+        f"linkedin_llm_first_token_seconds_total {llm['first_token_seconds']:.4f}",
+        "# TYPE linkedin_llm_early_stops_total counter",
+        f"linkedin_llm_early_stops_total {llm['early_stops']}",
+        "# TYPE linkedin_llm_budget_exceeded_total counter",
+        f"linkedin_llm_budget_exceeded_total {llm['budget_exceeded']}",
+        "# TYPE linkedin_answer_cache_hits_total counter",
+        f"linkedin_answer_cache_hits_total {answer_cache_stats['hits']}",
+        "# TYPE linkedin_answer_cache_misses_total counter",
+        f"linkedin_answer_cache_misses_total {answer_cache_stats['misses']}",
+        "# TYPE linkedin_answer_cache_reworded_hits_total counter",
+        f"linkedin_answer_cache_reworded_hits_total {answer_cache_stats['reworded_hits']}",
+        "# TYPE linkedin_network_responses_total counter",
+        f"linkedin_network_responses_total {network['requests']}",
+        "# TYPE linkedin_network_bytes_total counter",
+        f"linkedin_network_bytes_total {network['bytes']}",
+        "# TYPE linkedin_requests_blocked_total counter",
+        *(f'linkedin_requests_blocked_total{{reason="{reason}"}} {count}' for reason, count in network["blocked"]),
+    ]
+    return "\n".join(lines) + "\n"
+
+def start_metrics_server(port):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"Prometheus metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+def pacing_delay(min_seconds=None, max_seconds=None):
+    low = PACING_MIN_SECONDS if min_seconds is None else min_seconds
+    high = PACING_MAX_SECONDS if max_seconds is None else max_seconds
+    return random.uniform(low, max(low, high))
+
+def schedule_next_action(min_seconds=None, max_seconds=None):
+    # Pushes the shared click deadline out; never pulls in one another worker already reserved
+    with _pacing_lock:
+        next_at = time.time() + pacing_delay(min_seconds, max_seconds)
+        _next_account_action_at["click"] = max(_next_account_action_at["click"], next_at)
+
+def wait_for_pacing():
+    # Takes the next click slot: workers waiting together click one after another, jitter apart
+    with _pacing_lock:
+        now = time.time()
+        start_at = max(now, _next_account_action_at["click"])
+        _next_account_action_at["click"] = start_at + pacing_delay()
+    if start_at > now:
+        with timed_phase("pacing wait"):
+            time.sleep(start_at - now)
+
+def paced_click(target):
+    # Human-visible click: honour the jitter deadline, click, then start the next deadline
+    wait_for_pacing()
+    target.click()
+    schedule_next_action()
+
+def wait_for_step_change(page, previous_signature, timeout=DOM_WAIT_TIMEOUT_MS):
+    # Resolves once the modal shows a different, fully rendered step (or has closed)
+    try:
+        page.wait_for_function(
+            """prev => {
+                const modal = document.querySelector('div.jobs-easy-apply-modal');
+                if (!modal) return true;
+                if (modal.querySelector('.artdeco-loader, [aria-busy="true"]')) return false;
+                return (modal.innerText || '').slice(0, 2000) !== prev;
+            }""",
+            arg=previous_signature,
+            timeout=timeout,
+        )
+        return True
+    except Exception:
+        print("Modal did not change after navigation click.")
+        return False
 
-    raw_answer = response.json()['choices'][0]['message']['content'].strip()
-    # Clean unwanted characters
-    cleaned = re.sub(r"^\s*(\d+\.)\s*", "", raw_answer)
-    cleaned = re.sub(r"^\s*[-•]\s*", "", cleaned)
-    # Treat obviously invalid answers as blank
-    if not cleaned or cleaned.strip().lower() in ["0", "no", "none", "not sure", "n/a", "na", "i don't know", "unknown"]:
-        return ""
-    return cleaned
+def wait_for_job_details(page, job_id, timeout=DOM_WAIT_TIMEOUT_MS):
+    # After a card click, wait until the details panel is showing *that* job
+    try:
+        page.wait_for_function(
+            """id => {
+                const current = new URLSearchParams(location.search).get('currentJobId');
+                if (id && !id.startsWith('job-') && current !== id) return false;
+                const panel = document.querySelector('div.jobs-details, div.jobs-search__job-details');
+                return !!(panel && panel.querySelector('h1, h2'));
+            }""",
+            arg=job_id,
+            timeout=timeout,
+        )
+    except Exception:
+        print(f"Details panel did not load for job {job_id}.")
 
 
 def login_to_linkedin(page):
@@ -111,23 +1450,218 @@ def login_to_linkedin(page):
     try:
         page.wait_for_url("https://www.linkedin.com/feed/", timeout=60000)
         print("Logged in Successfully")
+        save_session_state(page.context)
+        return True
     except:
         page.screenshot(path="login_failed.png")
         print("Login failed. Check credentials or captcha requirement.")
         page.wait_for_timeout(10000)
+        return False
+
+# Network diet: images, fonts, video and ad/analytics beacons are never read by the scraper or the
+# form filler, so the context answers them locally instead of downloading them. Images get a 1x1
+# GIF so lazy-load and onload handlers still fire; everything else is aborted.
+TRANSPARENT_GIF = bytes.fromhex("47494638396101000100800000000000ffffff21f90401000000002c000000000100010000020144003b")
+_network_stats_lock = threading.Lock()
+network_stats = {"requests": 0, "bytes": 0, "blocked": {}}
+
+# URL shapes of each blocked resource type. Only these and BLOCKED_URL_PATTERNS are routed: with
+# the sync API a route handler runs only while the main thread is inside a Playwright call, so a
+# routed request stalls through every pacing sleep and LLM wait. Everything else goes straight
+# through without waiting on Python.
+RESOURCE_TYPE_URL_PATTERNS = {
+    "image": r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|bmp)(?:[?#]|$)|media\.licdn\.com/dms/image/",
+    "media": r"\.(?:mp4|webm|m3u8|mp3|m4a|ogg)(?:[?#]|$)|/dms/playlist/",
+    "font": r"\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)",
+    "stylesheet": r"\.css(?:[?#]|$)",
+}
+
+BROWSER_LAUNCH_ARGS = ["--disable-extensions", "--disable-background-networking", "--mute-audio"]
+
+def launch_browser(playwright):
+    return playwright.chromium.launch(headless=HEADLESS, args=BROWSER_LAUNCH_ARGS)
+
+def blocked_request_reason(url, resource_type):
+    lowered = url.lower()
+    if any(pattern in lowered for pattern in ALLOWED_URL_PATTERNS):
+        return None
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return resource_type
+    if any(pattern in lowered for pattern in BLOCKED_URL_PATTERNS):
+        return "tracking"
+    return None
+
+def handle_routed_request(route):
+    request = route.request
+    reason = blocked_request_reason(request.url, request.resource_type)
+    try:
+        if reason is None:
+            route.continue_()
+            return
+        with _network_stats_lock:
+            network_stats["blocked"][reason] = network_stats["blocked"].get(reason, 0) + 1
+        if reason == "image":
+            route.fulfill(status=200, content_type="image/gif", body=TRANSPARENT_GIF)
+        else:
+            route.abort("blockedbyclient")
+    except Exception as e:
+        # The page navigated away or closed while the request was in flight
+        print(f"Request routing failed for {request.url[:120]}: {e}")
 
-def search_linkedin_jobs_with_combined_input(page, job_title, job_location):
+def track_response_size(response):
+    # Content-Length arrives with the response event, so this costs no extra browser round trip
+    try:
+        size = int(response.headers.get("content-length") or 0)
+    except ValueError:
+        size = 0
+    with _network_stats_lock:
+        network_stats["requests"] += 1
+        network_stats["bytes"] += size
+
+def blocked_url_regex():
+    parts = [RESOURCE_TYPE_URL_PATTERNS[kind] for kind in BLOCKED_RESOURCE_TYPES if kind in RESOURCE_TYPE_URL_PATTERNS]
+    parts += [re.escape(pattern) for pattern in BLOCKED_URL_PATTERNS]
+    return re.compile("|".join(parts), re.IGNORECASE) if parts else None
+
+def install_request_routing(context):
+    context.on("response", track_response_size)
+    pattern = blocked_url_regex()
+    if BLOCK_RESOURCES and pattern:
+        # A regex is matched inside the browser, so unmatched requests are never paused
+        context.route(pattern, handle_routed_request)
+    return context
+
+def new_linkedin_context(browser):
+    # Headless Chromium announces itself in the user agent; present the regular desktop one
+    options = {}
+    if HEADLESS:
+        options["user_agent"] = (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+            f"Chrome/{browser.version} Safari/537.36"
+        )
+    # Reuse the cookies/local storage of the last successful login when we have them
+    if os.path.exists(STORAGE_STATE_PATH):
+        try:
+            return install_request_routing(browser.new_context(storage_state=STORAGE_STATE_PATH, **options))
+        except Exception as e:
+            print(f"Ignoring unreadable session file {STORAGE_STATE_PATH}: {e}")
+    return install_request_routing(browser.new_context(**options))
+
+# Warm browser: `daemon` keeps one logged-in Chromium running and advertises its DevTools endpoint
+# in BROWSER_DAEMON_STATE_PATH. Later runs attach to it over CDP and open a page in its context,
+# so they skip the browser launch and the login.
+def warm_browser_endpoint():
+    try:
+        with open(BROWSER_DAEMON_STATE_PATH, encoding="utf-8") as file:
+            state = json.load(file)
+        if state.get("profile", "default") != PROFILE_NAME:
+            return None  # logged in as another profile's account
+        endpoint = state["endpoint"]
+        get_http_session().get(f"{endpoint}/json/version", timeout=1).raise_for_status()
+        return endpoint
+    except Exception:
+        return None
+
+def open_linkedin_context(playwright):
+    # Returns (context, warm); a warm context belongs to the daemon and must stay open
+    endpoint = warm_browser_endpoint()
+    if endpoint:
+        try:
+            context = playwright.chromium.connect_over_cdp(endpoint).contexts[0]
+            print(f"Attached to the warm browser at {endpoint}.")
+            return install_request_routing(context), True
+        except Exception as e:
+            print(f"Warm browser at {endpoint} is not usable, launching a new one: {e}")
+    return new_linkedin_context(launch_browser(playwright)), False
+
+def run_browser_daemon():
+    from playwright.sync_api import sync_playwright
+
+    if warm_browser_endpoint():
+        print(f"A warm browser is already running (see {BROWSER_DAEMON_STATE_PATH}).")
+        return
+    endpoint = f"http://127.0.0.1:{BROWSER_DAEMON_PORT}"
+    with sync_playwright() as p:
+        # The default context of a persistent profile is the one a CDP client sees as contexts[0]
+        context = p.chromium.launch_persistent_context(
+            BROWSER_PROFILE_DIR,
+            headless=HEADLESS,
+            args=[*BROWSER_LAUNCH_ARGS, f"--remote-debugging-port={BROWSER_DAEMON_PORT}"],
+        )
+        if os.path.exists(STORAGE_STATE_PATH):
+            try:
+                with open(STORAGE_STATE_PATH, encoding="utf-8") as file:
+                    context.add_cookies(json.load(file).get("cookies", []))
+            except Exception as e:
+                print(f"Ignoring unreadable session file {STORAGE_STATE_PATH}: {e}")
+        page = context.pages[0] if context.pages else context.new_page()
+        ensure_logged_in(page)
+        save_session_state(context)
+        with open(BROWSER_DAEMON_STATE_PATH, "w", encoding="utf-8") as file:
+            json.dump({"endpoint": endpoint, "pid": os.getpid(), "profile": PROFILE_NAME}, file)
+        print(f"Warm browser ready at {endpoint}; runs started now attach to it. Ctrl-C to stop.")
+        try:
+            while True:
+                # Waiting inside Playwright keeps its event loop (and the session) serviced
+                page.wait_for_timeout(10 * 60 * 1000)
+                save_session_state(context)
+        except KeyboardInterrupt:
+            print("Stopping the warm browser.")
+        finally:
+            if os.path.exists(BROWSER_DAEMON_STATE_PATH):
+                os.remove(BROWSER_DAEMON_STATE_PATH)
+            context.close()
+
+def save_session_state(context):
+    try:
+        context.storage_state(path=STORAGE_STATE_PATH)
+    except Exception as e:
+        print(f"Could not save session state: {e}")
+
+def is_session_valid(context):
+    # Cheap authenticated probe: one API request with the stored cookies, no page render
+    csrf_token = next(
+        (c["value"].strip('"') for c in context.cookies("https://www.linkedin.com") if c["name"] == "JSESSIONID"),
+        None,
+    )
+    if not csrf_token:
+        return False
     try:
-        encoded_title = quote(job_title)
-        encoded_location = quote(job_location)
-        search_url = (
-            f"https://www.linkedin.com/jobs/search/?f_AL=true"
-            f"&keywords={encoded_title}"
-            f"&location={encoded_location}"
+        response = context.request.get(
+            "https://www.linkedin.com/voyager/api/me",
+            headers={"csrf-token": csrf_token, "Accept": "application/json"},
+            max_redirects=0,
+            timeout=10000,
         )
+        return response.status == 200
+    except Exception as e:
+        print(f"Session probe failed: {e}")
+        return False
+
+def ensure_logged_in(page):
+    with timed_phase("login"):
+        if is_session_valid(page.context):
+            print("Reusing saved LinkedIn session.")
+            return True
+        print("Saved session missing or expired — logging in with credentials.")
+        return login_to_linkedin(page)
+
+def build_job_search_url(job_title, job_location):
+    encoded_title = quote(job_title)
+    encoded_location = quote(job_location)
+    return (
+        f"https://www.linkedin.com/jobs/search/?f_AL=true"
+        f"&keywords={encoded_title}"
+        f"&location={encoded_location}"
+    )
+
+def search_linkedin_jobs_with_combined_input(page, job_title, job_location):
+    try:
+        search_url = build_job_search_url(job_title, job_location)
         print(f"Navigating to: {search_url}")
-        page.goto(search_url)
-        page.wait_for_timeout(5000)
+        with timed_phase("search load"):
+            page.goto(search_url)
+            page.wait_for_selector("div.job-card-container", timeout=DOM_WAIT_TIMEOUT_MS)
         print("Easy Apply job search loaded.")
     except Exception as e:
         print("Failed to load job search page:", e)
@@ -157,6 +1691,10 @@ def discard_application(page):
         print(f"Error while discarding application: {e}")
 
 def scroll_job_list(page, target_count=25):
+    with timed_phase("scroll"):
+        _scroll_job_list(page, target_count)
+
+def _scroll_job_list(page, target_count):
     try:
         print("Scrolling job list...")
         page.wait_for_selector("div.job-card-container", timeout=10000)
@@ -196,9 +1734,16 @@ def scroll_job_list(page, target_count=25):
                     container.scrollBy(0, 1000);
                 }
             """, scroll_container)
-            page.wait_for_timeout(1000)
             page.keyboard.press("PageDown")
-            page.wait_for_timeout(1000)
+            try:
+                # Return as soon as new cards render instead of sleeping a fixed 2 s
+                page.wait_for_function(
+                    "count => document.querySelectorAll('div.job-card-container').length > count",
+                    arg=current_count,
+                    timeout=2000,
+                )
+            except Exception:
+                pass
         final_count = len(page.query_selector_all("div.job-card-container"))
         print(f"Final job count after scroll: {final_count}")
     except Exception as e:
@@ -209,78 +1754,94 @@ def scroll_job_list(page, target_count=25):
             page.wait_for_timeout(1000)
         print("Fallback scroll completed.")
 
-def extract_and_fill_form_fields_across_steps(page, file_id):
+# Serialized model of an Easy Apply step: every label/span/p with its associated control.
+# Controls get a data-autofill-ref attribute so the few we write to can be found again directly.
+MODAL_SNAPSHOT_JS = """(modal) => {
+    const placeholders = ['', 'select', 'select an option', 'choose', 'n/a'];
+    const optionText = (input) =>
+        (input.nextElementSibling?.innerText || input.parentElement?.innerText || '').trim();
+    let nextRef = 0;
+    const refOf = (el) => {
+        if (!el.dataset.autofillRef) {
+            el.dataset.autofillRef = `${Date.now().toString(36)}-${nextRef++}`;
+        }
+        return el.dataset.autofillRef;
+    };
+    const controls = new Map();
+    const describe = (el) => {
+        if (controls.has(el)) return controls.get(el);
+        const tag = el.tagName.toLowerCase();
+        const type = (el.getAttribute('type') || '').toLowerCase();
+        const control = {
+            ref: refOf(el), group: refOf(el), tag, type, kind: 'text', id: el.id || '',
+            value: '', selected: '', options: [], choices: [], needs_answer: true,
+        };
+        if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+            const container = el.closest('fieldset') || el.parentElement?.parentElement || el.parentElement;
+            const inputs = container ? [...container.querySelectorAll("input[type='radio'], input[type='checkbox']")] : [el];
+            const checked = inputs.find(input => input.checked);
+            control.kind = type;
+            control.group = refOf(inputs[0] || el);
+            control.choices = inputs.map(input => ({text: optionText(input), ref: refOf(input)})).filter(c => c.text);
+            control.options = control.choices.map(c => c.text);
+            control.needs_answer = !checked;
+            control.selected = checked ? (optionText(checked) || 'Yes') : '';
+        } else if (tag === 'select') {
+            control.kind = 'select';
+            control.options = [...el.options].map(o => o.text.trim()).filter(t => !placeholders.includes(t.toLowerCase()));
+            control.value = (el.value || '').trim();
+            control.needs_answer = placeholders.includes(control.value.toLowerCase());
+        } else {
+            control.value = (el.value || '').trim();
+            control.needs_answer = !control.value;
+        }
+        controls.set(el, control);
+        return control;
+    };
+    return [...modal.querySelectorAll('label, span, p')].map(label => {
+        const text = (label.innerText || '').trim();
+        if (!text || text.length > 200) return {text, control: null};
+        let field = null;
+        const forAttr = label.getAttribute('for');
+        if (forAttr) field = modal.querySelector('#' + CSS.escape(forAttr));
+        if (!field) field = label.querySelector('input, select, textarea');
+        if (!field) field = label.closest('div, fieldset')?.querySelector('input, select, textarea') || null;
+        return {text, control: field ? describe(field) : null};
+    });
+}"""
+
+def extract_and_fill_form_fields_across_steps(page, file_id, form_labels_collected=None):
+    # Answers are recorded into the caller's dict so concurrent workers never share state
     abort_flag = {"should_abort": False}
-    global form_labels_collected
-    form_labels_collected = {}
+    if form_labels_collected is None:
+        form_labels_collected = {}
     print("\nExtracting and filling form fields from all steps:")
     seen = set()
 
-    def fill_field(field, label_text):
+    def get_field(control):
+        # Element handle for a snapshotted control; only fetched for fields we actually write to
+        return page.query_selector(f"div.jobs-easy-apply-modal [data-autofill-ref='{control['ref']}']")
+
+    def fill_field(control, label_text, prefetched_answer=None):
         try:
-            if not field:
+            if not control:
                 form_labels_collected[label_text] = "Not answered"
                 print(f"No field found for label: {label_text}")
                 return
 
-            try:
-                tag = field.evaluate("el => el?.tagName?.toLowerCase()")
-            except Exception as e:
-                print(f"Error evaluating tag for label '{label_text}': {e}")
-                form_labels_collected[label_text] = "Not answered"
-                return
-
-            input_type = field.get_attribute("type") or ""
+            tag = control["tag"]
+            input_type = control["type"]
 
-            if tag == "input":
-                if input_type in ["checkbox", "radio"]:
-                    try:
-                        if field.is_checked():
-                            selected_label = field.evaluate(
-                                """el => {
-                                    const next = el.nextElementSibling;
-                                    const parent = el.parentElement;
-                                    return (next?.innerText || parent?.innerText || 'Yes').trim();
-                                }"""
-                            )
-                            form_labels_collected[label_text] = selected_label
-                            print(f"Already selected: {label_text} = {selected_label}")
-                            return selected_label
-                    except Exception as e:
-                        print(f"Error checking checkbox/radio state for '{label_text}': {e}")
+            if not control["needs_answer"]:
+                current_value = control["selected"] or control["value"]
+                form_labels_collected[label_text] = current_value
+                print(f"Already filled: {label_text} = {current_value}")
+                return current_value
 
-                else:
-                    try:
-                        current_value = field.input_value().strip()
-                        if current_value:
-                            form_labels_collected[label_text] = current_value
-                            print(f"Already filled input: {label_text} = {current_value}")
-                            return current_value
-                    except Exception as e:
-                        print(f"Error reading input value for '{label_text}': {e}")
-
-            elif tag == "select":
-                try:
-                    current_value = field.input_value().strip()
-                    if current_value and current_value.lower() not in ["", "select", "select an option", "choose",
-                                                                       "n/a"]:
-                        form_labels_collected[label_text] = current_value
-                        print(f"Already selected dropdown: {label_text} = {current_value}")
-                        return current_value
-                except Exception as e:
-                    print(f"Error reading select value for '{label_text}': {e}")
-
-            elif tag == "textarea":
-                try:
-                    current_value = field.input_value().strip()
-                    if current_value:
-                        form_labels_collected[label_text] = current_value
-                        print(f"Already filled textarea: {label_text} = {current_value}")
-                        return current_value
-                except Exception as e:
-                    print(f"Error reading textarea value for '{label_text}': {e}")
-
-            answer = get_answer_from_llm(label_text, file_id).strip()
+            if prefetched_answer is not None:
+                answer = prefetched_answer.strip()
+            else:
+                answer = get_cached_answer_from_llm(label_text, file_id).strip()
 
             if not answer:
                 form_labels_collected[label_text] = "Not answered"
@@ -292,50 +1853,41 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
             print(f"Q: {label_text}")
             print(f"A: {answer}")
 
+            field = get_field(control)
+            if not field:
+                print(f"Field for '{label_text}' disappeared before it could be filled.")
+                return
+
             if tag == "input":
                 if input_type in ["checkbox", "radio"]:
                     try:
-                        field_id = field.get_attribute("id")
-                        if field_id:
-                            escaped_id = css_escape(field_id)
-                            parent = page.locator(f"#{escaped_id}").locator(
-                                "xpath=ancestor::*[self::fieldset or self::div][1]")
+                        choices = control["choices"]
+                        if input_type == "checkbox" and len(choices) <= 1:
+                            # A lone checkbox is a consent/confirmation: any affirmative answer ticks it
+                            affirmative = normalize_option_text(answer) in ("yes", "agree", "i agree")
+                            wanted = [choices[0]["text"]] if choices and affirmative else []
+                        elif input_type == "checkbox":
+                            parts = [part for part in re.split(r"[,;\n]| and ", answer) if part.strip()]
+                            wanted = [match_option(part, control["options"], label_text) for part in parts]
+                            wanted = [option for option in wanted if option] or [
+                                resolve_option_answer(label_text, answer, control["options"], "checkbox", file_id)
+                            ]
                         else:
-                            parent = page.locator("div.jobs-easy-apply-modal")
-
-                        options = parent.locator("input[type='radio'], input[type='checkbox']").all()
-                        matched = False
-                        for option in options:
-                            label = option.evaluate(
-                                """el => {
-                                    const next = el.nextElementSibling;
-                                    const parent = el.parentElement;
-                                    return (next?.innerText || parent?.innerText || '').trim().toLowerCase();
-                                }"""
-                            )
-                            print(f" → Found option: '{label}'")
-
-                            if label and (
-                                    label == answer.strip().lower()
-                                    or answer.strip().lower() in label
-                                    or is_similar(label, answer)
-                            ):
-                                try:
-                                    option.check()
-                                    print(f"Checked option: '{label}'")
-                                    matched = True
-                                    break
-                                except Exception as e:
-                                    print(f"check() failed: {e}")
-                                    try:
-                                        option.click(force=True)
-                                        print(f"Clicked option: '{label}'")
-                                        matched = True
-                                        break
-                                    except Exception as e2:
-                                        print(f"Click also failed: {e2}")
-                        if not matched:
-                            print(f"No matching option found for: '{answer}'")
+                            wanted = [resolve_option_answer(label_text, answer, control["options"], "radio", file_id)]
+                        refs = [choice["ref"] for choice in choices if choice["text"] in wanted]
+                        if not refs:
+                            print(f"No matching option found for: '{answer}' among {control['options']}")
+                        for ref in refs:
+                            option = page.query_selector(f"div.jobs-easy-apply-modal [data-autofill-ref='{ref}']")
+                            try:
+                                option.check()
+                            except Exception as e:
+                                print(f"check() failed, clicking instead: {e}")
+                                option.click(force=True)
+                        if refs:
+                            matched_text = ", ".join(choice["text"] for choice in choices if choice["ref"] in refs)
+                            form_labels_collected[label_text] = matched_text
+                            print(f"Checked option: '{matched_text}'")
                     except Exception as e:
                         print(f"Error handling checkbox/radio group: {e}")
                 else:
@@ -343,9 +1895,11 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
                         if "location" in label_text.lower() or "city" in label_text.lower():
                             field.click()
                             field.fill(answer)
-                            page.wait_for_timeout(1000)
+                            try:
+                                page.wait_for_selector("[role='listbox'] [role='option']", timeout=3000)
+                            except Exception:
+                                print("No typeahead suggestions appeared for location.")
                             field.press("ArrowDown")
-                            page.wait_for_timeout(500)
                             field.press("Enter")
                             print("Selected location using keyboard.")
                         else:
@@ -356,16 +1910,13 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
 
             elif tag == "select":
                 try:
-                    options = field.query_selector_all("option")
-                    matched = False
-                    for opt in options:
-                        opt_text = opt.inner_text().strip().lower()
-                        if answer.lower() in opt_text or opt_text in answer.lower():
-                            field.select_option(opt.get_attribute("value"))
-                            print(f"Selected dropdown option: {opt_text}")
-                            matched = True
-                            break
-                    if not matched:
+                    # Option texts come from the snapshot, so matching needs no extra round trips
+                    matched_option = resolve_option_answer(label_text, answer, control["options"], "select", file_id)
+                    if matched_option:
+                        form_labels_collected[label_text] = matched_option
+                        field.select_option(label=matched_option)
+                        print(f"Selected dropdown option: {matched_option}")
+                    else:
                         print(f"Could not match dropdown option for: '{answer}'")
                 except Exception as e:
                     print(f"Failed to handle dropdown '{label_text}': {e}")
@@ -391,50 +1942,61 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
             if not modal:
                 print("Easy Apply modal not found.")
                 return False
-            labels = modal.query_selector_all("label, span, p")
+            # One evaluate returns every label with its control; everything below is plain Python
+            with timed_phase("modal snapshot"):
+                snapshot = modal.evaluate(MODAL_SNAPSHOT_JS)
             seen = set()
-            for label in labels:
-                label_text = label.inner_text().strip()
+            claimed_groups = set()
+            fields_to_fill = []
+            for item in snapshot:
+                label_text = item["text"]
                 if not label_text or len(label_text) > 200:
                     continue
                 lower_label = label_text.lower()
                 if lower_label in seen:
                     continue
                 seen.add(lower_label)
-                skip_keywords = [
-                    "submit", "next", "review", "done", "upload", "cover letter", "resume", "cv",
-                    "dialog content", "powered by linkedin", "help center", "application settings",
-                    "33%", "50%", "66%", "100%", "last used", "learn more", "view", "back", "doc", "pdf", "mb"
-                ]
-                if any(k in lower_label for k in skip_keywords):
+                label_class = classify_label(label_text)
+                if label_class == "noise":
                     continue
-
-                if lower_label in {"yes", "no", "none", "other", "submit"}:
+                if label_class == "option":
                     print(f"Skipping standalone option label: '{label_text}'")
                     continue
 
-                field = None
-                for_attr = label.get_attribute("for")
-                if for_attr:
-                    field = modal.query_selector(f"#{for_attr}")
-                if not field:
-                    field = label.query_selector("input, select, textarea")
-                if not field:
-                    js_handle = label.evaluate_handle("el => el.closest('div, fieldset')?.querySelector('input, select, textarea') || null")
-                    field = js_handle.as_element() if js_handle else None
-                if not field:
+                control = item["control"]
+                if not control:
                     continue
 
-                input_type = field.get_attribute("type") or ""
-                if input_type == "file" or any(kw in lower_label for kw in ["resume", "cover letter", "cv"]):
-                    value = field.evaluate("el => el?.value || ''").strip()
-                    if value:
+                if control["type"] == "file" or any(kw in lower_label for kw in ["resume", "cover letter", "cv"]):
+                    if control["value"]:
                         print(f"Resume/Cover Letter already uploaded: {label_text} — skipping.")
                         continue
                     print(f"File upload input found (no value) — skipping without discarding: {label_text}")
                     continue
+
+                # The first label of a control (or radio/checkbox group) is its question;
+                # later labels pointing at the same group are its option captions
+                if control["group"] in claimed_groups:
+                    continue
+                claimed_groups.add(control["group"])
                 print(f"Label: {label_text}")
-                fill_field(field, label_text)
+                fields_to_fill.append((control, label_text))
+
+            prefetched = {}
+            if CONCURRENT_LLM_ANSWERS or LLM_BATCH_QUESTIONS:
+                pending = [
+                    {"question": label_text, "type": control["kind"], "options": control["options"]}
+                    for control, label_text in fields_to_fill
+                    if control["needs_answer"]
+                ]
+                if pending:
+                    print(f"Resolving {len(pending)} unanswered questions for this step.")
+                    with timed_phase("llm answers"):
+                        prefetched = resolve_step_answers(pending, file_id)
+
+            for control, label_text in fields_to_fill:
+                with timed_phase("field fill", label=label_text[:120], tag=control["tag"]):
+                    fill_field(control, label_text, prefetched.get(label_text))
 
             if abort_flag["should_abort"]:
                 print("LLM failed to answer a required field — discarding application.")
@@ -456,10 +2018,10 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
             continue_btn = page.locator("div.artdeco-modal button:has-text('Continue applying')").first
             if continue_btn and continue_btn.is_visible():
                 print("Clicking 'Continue applying' button.")
-                continue_btn.click()
-                time.sleep(random.uniform(15, 40))
-
-                page.wait_for_timeout(3000)
+                signature = page.evaluate(MODAL_SIGNATURE_JS)
+                with timed_phase("step navigation"):
+                    paced_click(continue_btn)
+                    wait_for_step_change(page, signature)
                 # continue the loop (go back to form filling)
                 continue
 
@@ -473,15 +2035,13 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
                 done_button = page.locator("button:has-text('Done')").first
                 if done_button and done_button.is_visible():
                     print("Clicking Done button.")
-                    done_button.click()
-                    time.sleep(random.uniform(15, 40))
+                    paced_click(done_button)
                     return True
 
                 close_button = page.locator("button[aria-label='Dismiss'], button[aria-label='Close']").first
                 if close_button and close_button.is_visible():
                     print("Clicking Close button to discard or exit modal.")
-                    close_button.click()
-                    time.sleep(random.uniform(15, 40))
+                    paced_click(close_button)
 
                     return True
 
@@ -491,17 +2051,15 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
             # Click navigation button
             btn_text = next_button.inner_text().strip()
             print(f"\nClicking: {btn_text}")
-            page.wait_for_timeout(3000)
-            next_button.click()
-            time.sleep(random.uniform(15, 40))
-
-            page.wait_for_timeout(8000)
+            signature = page.evaluate(MODAL_SIGNATURE_JS)
+            with timed_phase("step navigation"):
+                paced_click(next_button)
+                wait_for_step_change(page, signature)
 
             done_button = page.locator("button:has-text('Done')").first
             if done_button and done_button.is_visible():
                 print("Detected Done button after clicking:", btn_text)
-                done_button.click()
-                time.sleep(random.uniform(15, 40))
+                paced_click(done_button)
 
                 return True
 
@@ -520,155 +2078,1494 @@ def extract_and_fill_form_fields_across_steps(page, file_id):
                 pass
             return False
 
-def scrape_job_details(page, file_id, max_jobs=25):
-    scraped_jobs = []
-    processed_job_ids = set()
-    CSV_FILE = "application_log.csv"
-    if not os.path.exists(CSV_FILE):
-        with open(CSV_FILE, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=[
-                "Job Title", "Company Name", "Location", "Job Description"
-            ])
-            writer.writeheader()
-    page.wait_for_selector("div.job-card-container", timeout=10000)
-    jobs = page.query_selector_all("div.job-card-container")
-    if not jobs:
-        print("No job cards found.")
-        return scraped_jobs
-    for idx, job in enumerate(jobs):
-        if idx >= max_jobs:  # stop after max_jobs
-            break
+# Account-wide pacing shared by every worker: LinkedIn sees one account, however many pages we drive.
+# "click" is the jittered deadline of paced_click, "apply" the minimum gap between applications
+_pacing_lock = threading.Lock()
+_next_account_action_at = {"apply": 0.0, "click": 0.0}
+_job_claim_lock = threading.Lock()
+
+def wait_for_account_slot(kind="apply", min_interval=None):
+    interval = APPLY_MIN_INTERVAL_SECONDS if min_interval is None else min_interval
+    with _pacing_lock:
+        now = time.time()
+        start_at = max(now, _next_account_action_at.get(kind, 0.0))
+        _next_account_action_at[kind] = start_at + interval
+    if start_at > now:
+        time.sleep(start_at - now)
+
+def claim_job(job_id, processed_job_ids):
+    # Global duplicate-apply protection: only the first worker to claim an id may apply to it
+    with _job_claim_lock:
+        if job_id in processed_job_ids:
+            return False
+        processed_job_ids.add(job_id)
+        return True
+
+# Cross-run job index: every card we have applied to, discarded or found already-applied is
+# remembered here, so the next run filters it out before spending a click on it.
+_job_index_conn = None
+_job_index_lock = threading.Lock()
+
+JOB_CARDS_JS = """() => [...document.querySelectorAll('div.job-card-container')].map(card => {
+    const text = (selector) => (card.querySelector(selector)?.innerText || '').trim();
+    // Footer badges are whole lines ("Easy Apply", "Applied 2 days ago"); a title like
+    // "Applied Scientist" must not count as the applied badge
+    const lines = (card.innerText || '').split('\\n').map(line => line.trim().toLowerCase());
+    return {
+        id: card.getAttribute('data-job-id'),
+        title: text('.job-card-list__title, a.job-card-container__link, strong'),
+        company: text('.artdeco-entity-lockup__subtitle, .job-card-container__primary-description'),
+        location: text('.artdeco-entity-lockup__caption, .job-card-container__metadata-item'),
+        easy_apply: lines.some(line => line.includes('easy apply')),
+        applied: lines.some(line => line === 'applied' || /^applied\\b.*\\bago$/.test(line)),
+    };
+})"""
+
+def get_job_index():
+    global _job_index_conn
+    if _job_index_conn is None:
+        _job_index_conn = sqlite3.connect(JOB_INDEX_PATH, check_same_thread=False)
+        _job_index_conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                seen_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        _job_index_conn.commit()
+    return _job_index_conn
+
+def make_job_key(job_id, title="", company="", location=""):
+    if job_id:
+        return f"id:{job_id}"
+    # Cards without a data-job-id are identified by what the user sees on them
+    content = "|".join(part.strip().lower() for part in (title, company, location))
+    return "hash:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def read_job_cards(page):
+    # One evaluate for every loaded card instead of a round trip per card
+    cards = page.evaluate(JOB_CARDS_JS)
+    for index, card in enumerate(cards):
+        card["index"] = index
+        card["key"] = make_job_key(card["id"], card["title"], card["company"], card["location"])
+    return cards
+
+def seen_job_keys(keys):
+    keys = list(keys)
+    if not keys:
+        return set()
+    seen = set()
+    with _job_index_lock:
+        conn = get_job_index()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT job_key FROM seen_jobs WHERE job_key IN ({placeholders})", chunk)
+            seen.update(row[0] for row in rows)
+    return seen
+
+def record_job_outcome(job_key, status, title="", company="", location=""):
+    if not job_key:
+        return
+    with _job_index_lock:
+        conn = get_job_index()
+        conn.execute(
+            "INSERT OR REPLACE INTO seen_jobs (job_key, status, title, company, location, seen_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_key, status, title, company, location, time.time()),
+        )
+        conn.commit()
+
+# Application log: append-only JSON lines with a fixed schema. Entries are written in time order,
+# so readers can resume from a byte offset or binary-search a timestamp and only parse new rows.
+APPLICATION_LOG_FIELDS = [
+    "job_key", "job_title", "company_name", "location", "job_description",
+    "form_responses", "status", "applied_at", "profile",
+]
+_log_lock = threading.Lock()
+
+def ensure_application_log():
+    if not os.path.exists(APPLICATION_LOG_PATH):
+        open(APPLICATION_LOG_PATH, "a", encoding="utf-8").close()
+
+def make_log_entry(job_data, status="applied", applied_at=None):
+    return {
+        "job_key": job_data.get("Job Key"),
+        "job_title": job_data.get("Job Title", "N/A"),
+        "company_name": job_data.get("Company Name", "N/A"),
+        "location": job_data.get("Location", "N/A"),
+        "job_description": job_data.get("Job Description", "N/A"),
+        "form_responses": job_data.get("Form Responses") or {},
+        "status": status,
+        "applied_at": applied_at,
+        "profile": PROFILE_NAME,
+    }
+
+def append_application_log(job_data, status="applied"):
+    entry = make_log_entry(job_data, status, time.strftime("%Y-%m-%dT%H:%M:%S%z"))
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    with _log_lock:
+        with open(APPLICATION_LOG_PATH, mode="a", encoding="utf-8") as file:
+            file.write(line)
+
+def read_application_log(offset=0, since=None, path=None):
+    """
+    Incremental read: returns (entries, next_offset). Pass next_offset back in to get only rows
+    appended since the last call; `since` (epoch seconds or ISO string) skips older rows by
+    binary-searching the file instead of parsing it. A partially written last line is left for
+    the next call.
+    """
+    path = path or APPLICATION_LOG_PATH
+    if not os.path.exists(path):
+        return [], 0
+    if since is not None:
+        offset = max(offset, find_log_offset_for_time(since, path))
+    entries = []
+    with open(path, "rb") as file:
+        file.seek(offset)
+        for raw in file:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                entries.append(json.loads(raw))
+            except ValueError:
+                print(f"Skipping corrupt application log line at byte {offset - len(raw)}.")
+    return entries, offset
+
+def parse_log_time(value):
+    # Epoch seconds, an ISO date/time or an ISO date (local time); ValueError when none fits
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    formats = (("%Y-%m-%dT%H:%M:%S", 19), ("%Y-%m-%d %H:%M:%S", 19), ("%Y-%m-%dT%H:%M", 16), ("%Y-%m-%d", 10))
+    for pattern, length in formats:
         try:
-            job_id = job.get_attribute("data-job-id") or f"job-{idx}"
-            if job_id in processed_job_ids:
+            return time.mktime(time.strptime(value[:length], pattern))
+        except ValueError:
+            continue
+    raise ValueError(f"not an ISO date/time or epoch seconds: {value!r}")
+
+def _log_time(value):
+    try:
+        return parse_log_time(value)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+def find_log_offset_for_time(since, path=None):
+    # Byte offset of the first line whose applied_at >= since (lines are time ordered)
+    path = path or APPLICATION_LOG_PATH
+    target = _log_time(since)
+    with open(path, "rb") as file:
+
+        def line_start_at_or_after(pos):
+            if pos == 0:
+                return 0
+            file.seek(pos - 1)
+            if file.read(1) != b"\n":
+                file.readline()
+            return file.tell()
+
+        def line_at(pos):
+            file.seek(pos)
+            line = file.readline()
+            try:
+                return line, _log_time(json.loads(line).get("applied_at")) >= target
+            except ValueError:
+                return line, False
+
+        # Invariant: every line before `low` is older than target; the line at `high` (if any) isn't
+        low, high = 0, os.path.getsize(path)
+        while low < high:
+            start = line_start_at_or_after((low + high) // 2)
+            if start >= high:
+                start = low
+            line, newer = line_at(start)
+            if newer:
+                high = start
+            else:
+                low = start + len(line)
+        return low
+
+def migrate_csv_application_log(csv_path=None, jsonl_path=None):
+    """
+    One-off compaction of the legacy CSV log: drops the header and "-----" separator rows,
+    parses the stringified Form Responses dicts, and puts fixed-schema entries in front of the
+    JSONL log (skipping job keys it already contains). The CSV never recorded when a row was
+    written, so migrated rows are stamped with the CSV's last-modified time, moved back to the
+    oldest JSONL entry if that is earlier: the log stays in time order and `since` reads still
+    see them. Run it while no apply run is writing the log. Returns the number of entries written.
+    """
+    csv_path = csv_path or LOG_FILE_PATH or "application_log.csv"
+    jsonl_path = jsonl_path or APPLICATION_LOG_PATH
+    if not os.path.exists(csv_path):
+        print(f"No legacy log at {csv_path}.")
+        return 0
+    existing, _ = read_application_log(path=jsonl_path)
+    seen_keys = {entry.get("job_key") for entry in existing}
+    logged_times = [_log_time(entry["applied_at"]) for entry in existing if entry.get("applied_at")]
+    stamped_at = min([os.path.getmtime(csv_path), *logged_times])
+    applied_at = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(stamped_at))
+    csv.field_size_limit(10 * 1024 * 1024)
+    migrated = []
+    with open(csv_path, newline="", encoding="utf-8") as source:
+        for row in csv.reader(source):
+            if len(row) < 4 or row[0] == "Job Title" or set(row[0]) == {"-"}:
+                continue
+            responses = {}
+            if len(row) > 4 and row[4].strip():
+                try:
+                    responses = ast.literal_eval(row[4])
+                except (ValueError, SyntaxError):
+                    responses = {"_raw": row[4]}
+            job_data = {
+                "Job Title": row[0].strip() or "N/A",
+                "Company Name": row[1].strip() or "N/A",
+                "Location": row[2].strip() or "N/A",
+                "Job Description": row[3].strip() or "N/A",
+                "Form Responses": responses,
+            }
+            job_data["Job Key"] = make_job_key(None, job_data["Job Title"], job_data["Company Name"], job_data["Location"])
+            if job_data["Job Key"] in seen_keys:
                 continue
-            processed_job_ids.add(job_id)
-            # Click each job to load details
-            job.scroll_into_view_if_needed()
-            job.click()
-            page.wait_for_timeout(3000)
-
-            apply_btn = page.query_selector("button.jobs-apply-button")
-            if not apply_btn:
-                print("Already applied — skipping.")
+            seen_keys.add(job_data["Job Key"])
+            migrated.append(json.dumps(make_log_entry(job_data, "applied", applied_at), ensure_ascii=False) + "\n")
+    if migrated:
+        with _log_lock:
+            temp_path = jsonl_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as target:
+                target.writelines(migrated)
+                if os.path.exists(jsonl_path):
+                    with open(jsonl_path, encoding="utf-8") as current:
+                        shutil.copyfileobj(current, target)
+            os.replace(temp_path, jsonl_path)
+    print(f"Migrated {len(migrated)} entries from {csv_path} to {jsonl_path}.")
+    return len(migrated)
+
+# Detail prefetch: while the current application is being filled, the next jobs' descriptions are
+# fetched from the public job-posting endpoint in the background, so opening a job needs no
+# panel scroll or description wait. Anything the prefetch can't provide falls back to the DOM.
+JOB_POSTING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+_prefetch_executor = None
+
+def get_prefetch_executor():
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        _prefetch_executor = ThreadPoolExecutor(max_workers=max(PREFETCH_AHEAD, 1), thread_name_prefix="prefetch")
+    return _prefetch_executor
+
+def _html_block_text(html_text, class_name):
+    # Text of the first element carrying `class_name`, honouring nesting of the same tag
+    match = re.search(r'<(\w+)[^>]*\bclass="[^"]*\b' + re.escape(class_name) + r'\b[^"]*"[^>]*>', html_text)
+    if not match:
+        return ""
+    tag = match.group(1)
+    depth, pos = 1, match.end()
+    tag_pattern = re.compile(r"<(/?)" + tag + r"\b[^>]*>", re.IGNORECASE)
+    while depth:
+        found = tag_pattern.search(html_text, pos)
+        if not found:
+            break
+        depth += -1 if found.group(1) else 1
+        pos = found.end() if depth else found.start()
+    inner = html_text[match.end():pos]
+    inner = re.sub(r"<br\s*/?>|</(p|li|div|h\d)>", "\n", inner, flags=re.IGNORECASE)
+    inner = html.unescape(re.sub(r"<[^>]+>", "", inner))
+    inner = "\n".join(re.sub(r"[ \t]+", " ", line).strip() for line in inner.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", inner).strip()
+
+def fetch_job_posting(job_id):
+    response = get_http_session().get(
+        JOB_POSTING_URL.format(job_id=job_id),
+        headers={"User-Agent": "Mozilla/5.0", "Accept": "text/html"},
+        timeout=15,
+    )
+    response.raise_for_status()
+    page_html = response.text
+    return {
+        "title": _html_block_text(page_html, "topcard__title"),
+        "company": _html_block_text(page_html, "topcard__org-name-link"),
+        "location": _html_block_text(page_html, "topcard__flavor--bullet"),
+        "description": _html_block_text(page_html, "show-more-less-html__markup"),
+    }
+
+def prefetch_job_postings(job_ids, futures):
+    # Submits a background fetch for each id not already in flight; `futures` maps id -> Future
+    if not JOB_DETAILS_PREFETCH:
+        return
+    executor = get_prefetch_executor()
+    for job_id in job_ids:
+        if job_id and job_id not in futures:
+            futures[job_id] = executor.submit(fetch_job_posting, job_id)
+
+def take_prefetched_posting(futures, job_id, timeout=5):
+    future = futures.pop(job_id, None)
+    if future is None:
+        return None
+    try:
+        posting = future.result(timeout=timeout)
+    except Exception as e:
+        print(f"Prefetch failed for job {job_id}: {e}")
+        return None
+    return posting if posting.get("description") else None
+
+# Relevance pre-filter: cheap rules first (excluded companies, seniority, location), then a
+# TF-IDF cosine between the resume and each job's title + description. Only the top K jobs
+# above RELEVANCE_MIN_SCORE reach the multi-minute apply flow.
+STOPWORDS = set("""
+a an and are as at be by for from has have in is it its of on or our that the their this to we
+will with you your who what when where which about into over using use able also any all can
+""".split())
+TITLE_WEIGHT = 3
+
+def tokenize(text):
+    tokens = re.findall(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*", (text or "").lower())
+    return [token for token in tokens if token not in STOPWORDS and len(token) > 1]
+
+def build_tfidf_vectors(token_lists):
+    # Sparse, L2-normalised TF-IDF vectors (dict term -> weight), one pass over the corpus
+    doc_freq = {}
+    for tokens in token_lists:
+        for term in set(tokens):
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+    total_docs = len(token_lists)
+    vectors = []
+    for tokens in token_lists:
+        counts = {}
+        for term in tokens:
+            counts[term] = counts.get(term, 0) + 1
+        vector = {
+            term: (1 + math.log(count)) * (math.log((1 + total_docs) / (1 + doc_freq[term])) + 1)
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({term: weight / norm for term, weight in vector.items()})
+    return vectors
+
+def cosine_similarity(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+def job_rule_rejection(card):
+    title = (card.get("title") or "").lower()
+    company = (card.get("company") or "").lower()
+    location = (card.get("location") or "").lower()
+    if any(excluded and excluded in company for excluded in EXCLUDED_COMPANIES):
+        return "excluded company"
+    if any(re.search(r"\b" + re.escape(word) + r"\b", title) for word in EXCLUDED_TITLE_KEYWORDS if word):
+        return "seniority"
+    if ALLOWED_LOCATION_KEYWORDS and not any(word in location for word in ALLOWED_LOCATION_KEYWORDS):
+        return "location"
+    return None
+
+def rank_job_cards(cards, postings, top_k):
+    """
+    Returns the cards worth applying to, best first, each annotated with its relevance "score".
+    `postings` maps job id -> prefetched details; cards without one are scored on title alone.
+    """
+    kept = []
+    for card in cards:
+        reason = job_rule_rejection(card)
+        if reason:
+            print(f"Filtered out ({reason}): {card.get('title')} @ {card.get('company')}")
+            continue
+        kept.append(card)
+    if not kept:
+        return []
+
+    documents = [tokenize(get_resume_text())]
+    for card in kept:
+        posting = postings.get(card.get("id")) or {}
+        title_tokens = tokenize(card.get("title") or posting.get("title"))
+        documents.append(title_tokens * TITLE_WEIGHT + tokenize(posting.get("description")))
+    vectors = build_tfidf_vectors(documents)
+    resume_vector = vectors[0]
+    for card, vector in zip(kept, vectors[1:]):
+        card["score"] = cosine_similarity(resume_vector, vector)
+
+    ranked = sorted(kept, key=lambda card: card["score"], reverse=True)
+    selected = [card for card in ranked if card["score"] >= RELEVANCE_MIN_SCORE][:top_k]
+    for card in ranked:
+        marker = "apply" if card in selected else "skip "
+        print(f"  [{marker}] {card['score']:.3f}  {card.get('title')} @ {card.get('company')}")
+    return selected
+
+def fetch_postings_for_ranking(cards, postings):
+    # Descriptions for every candidate, fetched concurrently; failures just score on the title
+    futures = {}
+    prefetch_job_postings([card["id"] for card in cards], futures)
+    for job_id in list(futures):
+        posting = take_prefetched_posting(futures, job_id, timeout=20)
+        if posting:
+            postings[job_id] = posting
+    return postings
+
+# Search sweep: titles x locations x date-posted x workplace filters, paged with start= instead of
+# scroll polling. Discovery runs in a background thread against the public search endpoint and
+# streams deduplicated cards into a bounded queue that the apply loop consumes.
+GUEST_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+DATE_POSTED_FILTERS = {"any": None, "day": "r86400", "week": "r604800", "month": "r2592000"}
+WORKPLACE_FILTERS = {"any": None, "onsite": "1", "remote": "2", "hybrid": "3"}
+SEARCH_PAGE_SIZE = 25
+
+def search_filter_params(date_posted=None, workplace=None, start=0):
+    params = ""
+    if DATE_POSTED_FILTERS.get(date_posted or "any"):
+        params += f"&f_TPR={DATE_POSTED_FILTERS[date_posted]}"
+    if WORKPLACE_FILTERS.get(workplace or "any"):
+        params += f"&f_WT={WORKPLACE_FILTERS[workplace]}"
+    if start:
+        params += f"&start={start}"
+    return params
+
+def search_sweep_queries():
+    return [
+        {"title": title, "location": location, "date_posted": date_posted, "workplace": workplace}
+        for title, location, date_posted, workplace in itertools.product(
+            SEARCH_TITLES, SEARCH_LOCATIONS, SEARCH_DATE_POSTED, SEARCH_WORKPLACES
+        )
+    ]
+
+def fetch_search_page(query, start):
+    url = (
+        f"{GUEST_SEARCH_URL}?f_AL=true&keywords={quote(query['title'])}&location={quote(query['location'])}"
+        + search_filter_params(query["date_posted"], query["workplace"], start)
+    )
+    response = get_http_session().get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
+    if response.status_code in (400, 404):  # past the last page
+        return []
+    response.raise_for_status()
+    cards = []
+    for chunk in response.text.split("<li")[1:]:
+        job_id = re.search(r"urn:li:jobPosting:(\d+)", chunk)
+        if not job_id:
+            continue
+        card = {
+            "id": job_id.group(1),
+            "title": _html_block_text(chunk, "base-search-card__title"),
+            "company": _html_block_text(chunk, "base-search-card__subtitle"),
+            "location": _html_block_text(chunk, "job-search-card__location"),
+            "easy_apply": True,
+            "applied": False,
+        }
+        card["key"] = make_job_key(card["id"])
+        cards.append(card)
+    return cards
+
+def sweep_job_candidates(candidate_queue, stop_event, start_query=0, start_page=0):
+    # Producer: one batch per results page, already deduplicated and filtered against the job index.
+    # Each batch travels with the cursor of the page after it, so a resumed run can start there.
+    queued = set()
+    try:
+        for query_index, query in enumerate(search_sweep_queries()):
+            if query_index < start_query:
                 continue
-            # Extract job details
-            job_title = page.query_selector("h2.topcard__title") or page.query_selector("h1")
-            company_name = (
-                page.query_selector("a.topcard__org-name-link") or
-                page.query_selector("span.topcard__flavor") or
-                page.query_selector("div.artdeco-entity-lockup__subtitle")
+            search_url = build_job_search_url(query["title"], query["location"]) + search_filter_params(
+                query["date_posted"], query["workplace"]
             )
-            location = (
-                page.query_selector("span.jobs-unified-top-card__bullet") or
-                page.query_selector("span.topcard__flavor--bullet") or
-                page.query_selector("div.artdeco-entity-lockup__caption")
-            )
-            right_panel = page.query_selector("div.jobs-details") or page.query_selector("div.jobs-search__job-details")
-            if right_panel:
-                right_panel.scroll_into_view_if_needed()
-                page.mouse.wheel(0, 5000)
-                page.wait_for_timeout(1500)
-            job_description = page.query_selector("div.job-details-module.jobs-description")
-            # Clean text
-            title_text = job_title.inner_text().strip() if job_title else "N/A"
-            company_text = company_name.inner_text().strip() if company_name else "N/A"
-            location_text = location.inner_text().strip() if location else "N/A"
-            desc_text = job_description.inner_text().strip() if job_description else "N/A"
-
-            apply_btn.click()
-            page.wait_for_timeout(2000)
-            extract_and_fill_form_fields_across_steps(page, file_id)
-            # Save to list & CSV
-            job_data = {
-                "Job Title": title_text,
-                "Company Name": company_text,
-                "Location": location_text,
-                "Job Description": desc_text,
-                "Form Responses": form_labels_collected
+            first_page = start_page if query_index == start_query else 0
+            for page_number in range(first_page, SEARCH_PAGES_PER_QUERY):
+                if stop_event.is_set():
+                    return
+                try:
+                    with timed_phase("search sweep page"):
+                        cards = fetch_search_page(query, page_number * SEARCH_PAGE_SIZE)
+                except Exception as e:
+                    print(f"Search sweep failed for {query}: {e}")
+                    break
+                if not cards:
+                    break
+                fresh = [card for card in cards if card["key"] not in queued]
+                queued.update(card["key"] for card in fresh)
+                already_seen = seen_job_keys(card["key"] for card in fresh)
+                batch = [dict(card, search_url=search_url) for card in fresh if card["key"] not in already_seen]
+                print(
+                    f"Sweep '{query['title']}' in '{query['location']}' page {page_number + 1}: "
+                    f"{len(batch)} new of {len(cards)}"
+                )
+                if batch:
+                    # blocks when the apply side falls behind
+                    candidate_queue.put(({"query": query_index, "page": page_number + 1}, batch))
+                time.sleep(random.uniform(SEARCH_SWEEP_MIN_DELAY, SEARCH_SWEEP_MAX_DELAY))
+    finally:
+        candidate_queue.put(None)
+
+def sweep_job_cards(cursor=None):
+    # Consumer side of the sweep: a card stream for run_job_pipeline. Closing it stops the producer.
+    cursor = cursor or {}
+    candidate_queue = queue.Queue(maxsize=4)
+    stop_event = threading.Event()
+    producer = threading.Thread(
+        target=sweep_job_candidates,
+        args=(candidate_queue, stop_event, cursor.get("query", 0), cursor.get("page", 0)),
+        name="search-sweep",
+        daemon=True,
+    )
+    producer.start()
+    try:
+        while True:
+            item = candidate_queue.get()
+            if item is None:
+                return
+            page_cursor, batch = item
+            checkpoint_pending(batch, page_cursor)
+            yield from batch
+    finally:
+        stop_event.set()
+        # Unblock the producer if it is waiting on a full queue
+        while producer.is_alive():
+            try:
+                candidate_queue.get_nowait()
+            except queue.Empty:
+                producer.join(timeout=0.5)
+
+def apply_to_open_job(page, file_id, job_key=None, card=None, posting=None):
+    # Runs the Easy Apply flow for the job currently shown in the details panel.
+    # Returns the job data dict (with its "Status"), or None when the job was already applied to.
+    # `card` (list harvest) and `posting` (prefetched details) spare the panel probes when present.
+    with timed_phase("detail extraction"):
+        details = _extract_open_job_details(page, card, posting)
+    if not details:
+        record_job_outcome(job_key, "already_applied")
+        return None
+    apply_btn, title_text, company_text, location_text, desc_text = details
+
+    wait_for_account_slot("apply")
+    paced_click(apply_btn)
+    page.wait_for_selector("div.jobs-easy-apply-modal", timeout=DOM_WAIT_TIMEOUT_MS)
+    form_responses = {}
+    with timed_phase("easy apply flow"):
+        completed = extract_and_fill_form_fields_across_steps(page, file_id, form_responses)
+    return {
+        "Job Key": job_key,
+        "Job Title": title_text,
+        "Company Name": company_text,
+        "Location": location_text,
+        "Job Description": desc_text,
+        "Form Responses": form_responses,
+        "Status": "applied" if completed else "discarded",
+    }
 
-            }
-            scraped_jobs.append(job_data)
-            with open(CSV_FILE, mode="a", newline="", encoding="utf-8") as file:
-                writer = csv.DictWriter(file, fieldnames=job_data.keys())
-                writer.writerow(job_data)
-                writer.writerow({key: "-" * 20 for key in job_data.keys()})
-            print(f"Saved job {idx+1}: {title_text} @ {company_text}")
-        except Exception as e:
-            print(f"Error scraping job #{idx + 1}: {e}")
+def persist_job(job_data):
+    status = job_data.get("Status", "applied")
+    checkpoint_job(job_data.get("Job Key"), status, form_responses=job_data.get("Form Responses"))
+    count_outcome(status, title=job_data["Job Title"], company=job_data["Company Name"])
+    record_job_outcome(
+        job_data.get("Job Key"), status, job_data["Job Title"], job_data["Company Name"], job_data["Location"]
+    )
+    with timed_phase("log write"):
+        append_application_log(job_data, status)
+    enqueue_job_for_postgres(job_data)
+
+def _extract_open_job_details(page, card=None, posting=None):
+    apply_btn = page.query_selector("button.jobs-apply-button")
+    if not apply_btn:
+        print("Already applied — skipping.")
+        return None
+    if "easy apply" not in apply_btn.inner_text().lower():
+        print("Not an Easy Apply job — skipping.")
+        return None
+    if posting:
+        card = card or {}
+        return (
+            apply_btn,
+            posting.get("title") or card.get("title") or "N/A",
+            posting.get("company") or card.get("company") or "N/A",
+            posting.get("location") or card.get("location") or "N/A",
+            posting["description"],
+        )
+    # Extract job details
+    job_title = page.query_selector("h2.topcard__title") or page.query_selector("h1")
+    company_name = (
+        page.query_selector("a.topcard__org-name-link") or
+        page.query_selector("span.topcard__flavor") or
+        page.query_selector("div.artdeco-entity-lockup__subtitle")
+    )
+    location = (
+        page.query_selector("span.jobs-unified-top-card__bullet") or
+        page.query_selector("span.topcard__flavor--bullet") or
+        page.query_selector("div.artdeco-entity-lockup__caption")
+    )
+    right_panel = page.query_selector("div.jobs-details") or page.query_selector("div.jobs-search__job-details")
+    if right_panel:
+        right_panel.scroll_into_view_if_needed()
+        page.mouse.wheel(0, 5000)
+    try:
+        page.wait_for_selector("div.job-details-module.jobs-description", timeout=5000)
+    except Exception:
+        print("Job description did not render.")
+    job_description = page.query_selector("div.job-details-module.jobs-description")
+    # Clean text
+    title_text = job_title.inner_text().strip() if job_title else "N/A"
+    company_text = company_name.inner_text().strip() if company_name else "N/A"
+    location_text = location.inner_text().strip() if location else "N/A"
+    desc_text = job_description.inner_text().strip() if job_description else "N/A"
+    return apply_btn, title_text, company_text, location_text, desc_text
+
+# Run checkpoint: the candidate queue, each job's state (pending / in_progress / applied /
+# discarded / skipped / errored), the sweep cursor and the collected form responses, rewritten
+# atomically (temp file + rename) on every transition. `--resume` continues from it: unfinished
+# jobs first, then discovery from the saved cursor; finished jobs are never redone.
+CHECKPOINT_CARD_FIELDS = ("id", "key", "title", "company", "location", "search_url")
+RESUMABLE_STATES = ("in_progress", "pending")
+_checkpoint = None
+_checkpoint_lock = threading.Lock()
+
+def save_checkpoint():
+    with _checkpoint_lock:
+        if _checkpoint is None:
+            return
+        _checkpoint["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        data = json.dumps(_checkpoint, ensure_ascii=False)
+        temp_path = CHECKPOINT_PATH + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, CHECKPOINT_PATH)
+
+def load_checkpoint():
+    global _checkpoint
+    try:
+        with open(CHECKPOINT_PATH, encoding="utf-8") as file:
+            _checkpoint = json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Ignoring unreadable checkpoint {CHECKPOINT_PATH}: {e}")
+        return None
+    return _checkpoint
+
+def start_checkpoint(mode, search, max_jobs):
+    global _checkpoint
+    _checkpoint = {
+        "run_id": RUN_ID,
+        "status": "running",
+        "mode": mode,
+        "search": search,
+        "cursor": {},
+        "max_jobs": max_jobs,
+        "jobs": {},
+    }
+    save_checkpoint()
+
+def checkpoint_job(job_key, state, card=None, form_responses=None):
+    if _checkpoint is None or not job_key:
+        return
+    with _checkpoint_lock:
+        entry = _checkpoint["jobs"].setdefault(job_key, {})
+        entry["state"] = state
+        if card is not None:
+            entry["card"] = {field: card.get(field) for field in CHECKPOINT_CARD_FIELDS}
+        if form_responses is not None:
+            entry["form_responses"] = form_responses
+    save_checkpoint()
+
+def checkpoint_pending(cards, cursor=None):
+    # New candidates and the cursor that produced them go to disk in one write
+    if _checkpoint is None:
+        return
+    with _checkpoint_lock:
+        for card in cards:
+            if card["key"] not in _checkpoint["jobs"]:
+                _checkpoint["jobs"][card["key"]] = {
+                    "state": "pending",
+                    "card": {field: card.get(field) for field in CHECKPOINT_CARD_FIELDS},
+                }
+        if cursor is not None:
+            _checkpoint["cursor"] = cursor
+    save_checkpoint()
+
+def track_pending(cards):
+    for card in cards:
+        checkpoint_pending([card])
+        yield card
+
+def finish_checkpoint():
+    if _checkpoint is None:
+        return
+    with _checkpoint_lock:
+        _checkpoint["status"] = "completed"
+    save_checkpoint()
+
+def checkpoint_remaining_budget():
+    with _checkpoint_lock:
+        done = sum(1 for entry in _checkpoint["jobs"].values() if entry["state"] in ("applied", "discarded", "errored"))
+        return max(_checkpoint["max_jobs"] - done, 0)
+
+def checkpoint_resume_cards():
+    # Interrupted jobs first, then the queue in the order it was discovered
+    with _checkpoint_lock:
+        jobs = list(_checkpoint["jobs"].values())
+        search = _checkpoint.get("search") or {}
+    search_url = build_job_search_url(search["title"], search["location"]) if search.get("title") else None
+    cards = []
+    for state in RESUMABLE_STATES:
+        for entry in jobs:
+            card = dict(entry.get("card") or {})
+            if entry["state"] != state or not card.get("id"):
+                continue
+            # Resumed jobs are opened by id: the list they came from is not loaded any more
+            card.setdefault("search_url", None)
+            card["search_url"] = card["search_url"] or search_url
+            card.update(easy_apply=True, applied=False)
+            cards.append(card)
+    return cards
+
+# Streaming pipeline: discovery -> filter -> relevance -> apply -> persist. Every stage is a
+# generator pulling from the one before it, so the list is only scrolled when the apply loop
+# wants another card, nothing is held beyond the ranking window, and each finished job is
+# written to the log, the job index and the Postgres queue the moment it comes out.
+SCROLL_TO_LAST_CARD_JS = """() => {
+    const cards = document.querySelectorAll('div.job-card-container');
+    if (cards.length) cards[cards.length - 1].scrollIntoView({block: 'end'});
+    return cards.length;
+}"""
+
+def discover_job_cards(page, max_cards=100, max_stalled_scrolls=4):
+    try:
+        page.wait_for_selector("div.job-card-container", timeout=DOM_WAIT_TIMEOUT_MS)
+    except Exception:
+        print("No job cards found.")
+        return
+    yielded = set()
+    stalled = 0
+    while len(yielded) < max_cards and stalled < max_stalled_scrolls:
+        with timed_phase("list harvest"):
+            cards = read_job_cards(page)
+        fresh = [card for card in cards if card["key"] not in yielded]
+        stalled = 0 if fresh else stalled + 1
+        for card in fresh:
+            if len(yielded) >= max_cards:
+                return
+            yielded.add(card["key"])
+            yield card
+        # Only reached once downstream has consumed everything loaded so far
+        with timed_phase("scroll"):
+            count = page.evaluate(SCROLL_TO_LAST_CARD_JS)
+            try:
+                page.wait_for_function(
+                    "count => document.querySelectorAll('div.job-card-container').length > count",
+                    arg=count,
+                    timeout=2000,
+                )
+            except Exception:
+                pass
+
+def filter_new_candidates(cards):
+    for card in cards:
+        if card["key"] in seen_job_keys([card["key"]]):
+            print(f"Skipping {card.get('title')} @ {card.get('company')}: handled in an earlier run.")
+            count_outcome("skipped", "seen in earlier run", job_key=card["key"])
+            continue
+        if card.get("applied"):
+            record_job_outcome(card["key"], "already_applied", card["title"], card["company"], card["location"])
+            count_outcome("skipped", "already applied", job_key=card["key"])
             continue
-    return scraped_jobs
+        yield card
+
+def _rank_window(cards):
+    with timed_phase("relevance ranking"):
+        postings = fetch_postings_for_ranking([card for card in cards if card["id"]], {})
+        ranked = rank_job_cards(cards, postings, len(cards))
+    selected = {card["key"] for card in ranked}
+    for card in cards:
+        if card["key"] not in selected:
+            count_outcome("skipped", "relevance", job_key=card["key"], score=card.get("score"))
+            checkpoint_job(card["key"], "skipped")
+    for card in ranked:
+        card["posting"] = postings.get(card["id"])
+        yield card
+
+def rank_in_windows(cards, window=RANK_WINDOW, top_k=RELEVANCE_TOP_K):
+    # Ranking needs a few jobs side by side; RANK_WINDOW bounds how many are buffered at once
+    passed = 0
+    buffer = []
+    for card in cards:
+        buffer.append(card)
+        if len(buffer) < window:
+            continue
+        for ranked in _rank_window(buffer):
+            yield ranked
+            passed += 1
+            if top_k and passed >= top_k:
+                return
+        buffer = []
+    if buffer:
+        for ranked in _rank_window(buffer):
+            yield ranked
+            passed += 1
+            if top_k and passed >= top_k:
+                return
 
-DB_HOST = "localhost"
-DB_NAME = "postgres"      # your database name
-DB_USER = "postgres"      # your PostgreSQL username
-DB_PASS = "2312"          # your PostgreSQL password
+def prefetch_details(cards, ahead=PREFETCH_AHEAD):
+    # Keeps `ahead` cards in flight so their descriptions load while the current job is applied to
+    futures = {}
+    pending = deque()
+    for card in cards:
+        pending.append(card)
+        prefetch_job_postings([card["id"]], futures)
+        if len(pending) > ahead:
+            ready = pending.popleft()
+            ready["posting"] = take_prefetched_posting(futures, ready["id"])
+            yield ready
+    while pending:
+        ready = pending.popleft()
+        ready["posting"] = take_prefetched_posting(futures, ready["id"])
+        yield ready
+
+def open_job_card(page, card):
+    if card.get("search_url"):
+        page.goto(f"{card['search_url']}&currentJobId={card['id']}")
+    else:
+        job = None
+        if card["id"]:
+            job = page.query_selector(f'div.job-card-container[data-job-id="{card["id"]}"]')
+        if job is None:
+            job = page.query_selector_all("div.job-card-container")[card["index"]]
+        job.scroll_into_view_if_needed()
+        job.click()
+    wait_for_job_details(page, card["id"])
+
+def apply_candidates(page, file_id, candidates, max_jobs=25, processed_job_ids=None):
+    if processed_job_ids is None:
+        processed_job_ids = set()
+    attempted = 0
+    if max_jobs <= 0:
+        return
+    for card in candidates:
+        if not claim_job(card["key"], processed_job_ids):
+            continue
+        attempted += 1
+        checkpoint_job(card["key"], "in_progress", card)
+        with job_metrics_context(card["key"]):
+            try:
+                with timed_phase("card click"):
+                    open_job_card(page, card)
+                job_data = apply_to_open_job(page, file_id, card["key"], card, card.get("posting"))
+                if not job_data:
+                    count_outcome("skipped", "not applicable")
+                    checkpoint_job(card["key"], "skipped")
+            except Exception as e:
+                print(f"Error processing job {card['id'] or card['key']}: {e}")
+                count_outcome("errored", type(e).__name__)
+                checkpoint_job(card["key"], "errored")
+                job_data = None
+                # Don't leave a half-filled modal in front of the next card
+                if page.query_selector("div.jobs-easy-apply-modal"):
+                    discard_application(page)
+            if job_data:
+                yield job_data
+        if attempted >= max_jobs:  # stop pulling cards once the budget is spent
+            return
 
-def save_job_to_postgres(jobs):
+def persist_jobs(results):
+    for job_data in results:
+        persist_job(job_data)
+        print(f"Saved job: {job_data['Job Title']} @ {job_data['Company Name']} ({job_data['Status']})")
+        yield job_data
+
+def run_job_pipeline(page, file_id, cards, max_jobs=25, resumed_cards=()):
+    """
+    Streams `cards` (any iterable of harvested job cards) through dedup, relevance, apply and
+    persistence, yielding each job's data once it has been written. `resumed_cards` come from a
+    checkpoint and already passed the filters, so they go straight to the apply stage first.
+    Closing the pipeline closes the card source too.
+    """
+    ensure_application_log()
+    candidates = track_pending(filter_new_candidates(cards))
+    candidates = rank_in_windows(candidates) if JOB_RANKING else prefetch_details(candidates)
+    candidates = itertools.chain(prefetch_details(resumed_cards), candidates)
     try:
-        conn = psycopg2.connect(
-            host="localhost",
-            dbname="postgres",
-            user="postgres",
-            password="2312"
-        )
-        cursor = conn.cursor()
-
-        # If single dict → wrap into a list
-        if isinstance(jobs, dict):
-            jobs = [jobs]
-
-        for job in jobs:
-            # Normalize form responses
-            responses = job.get("Form Responses", {})
-            normalized_responses = {
-                label: (answer if answer and str(answer).strip() else "Not answered")
-                for label, answer in responses.items()
-            }
+        yield from persist_jobs(apply_candidates(page, file_id, candidates, max_jobs))
+    finally:
+        if hasattr(cards, "close"):
+            cards.close()
+
+def collect_job_ids(page, max_jobs=25):
+    cards = [card for card in read_job_cards(page) if card["id"]]
+    already_seen = seen_job_keys(card["key"] for card in cards)
+    if already_seen:
+        print(f"Skipping {len(already_seen)} jobs handled in earlier runs.")
+    for card in cards:
+        if card["applied"] and card["key"] not in already_seen:
+            record_job_outcome(card["key"], "already_applied", card["title"], card["company"], card["location"])
+    cards = [card for card in cards if card["key"] not in already_seen and not card["applied"]]
+    if JOB_RANKING and cards:
+        with timed_phase("relevance ranking"):
+            postings = fetch_postings_for_ranking(cards, {})
+            cards = rank_job_cards(cards, postings, RELEVANCE_TOP_K or max_jobs)
+    ids = [card["id"] for card in cards]
+    return list(dict.fromkeys(ids))[:max_jobs]
+
+def run_apply_worker(worker_id, job_queue, search_url, file_id, processed_job_ids, results):
+    # The sync Playwright API is bound to the thread that started it, so each worker drives its
+    # own Chromium; the logged-in session is shared through the saved storage state.
+    from playwright.sync_api import sync_playwright
 
-            form_responses_json = json.dumps(
-                normalized_responses,
-                ensure_ascii=False
+    with sync_playwright() as p:
+        browser = launch_browser(p)
+        context = new_linkedin_context(browser)
+        page = context.new_page()
+        while True:
+            try:
+                job_id = job_queue.get_nowait()
+            except queue.Empty:
+                break
+            job_key = make_job_key(job_id)
+            if not claim_job(job_key, processed_job_ids):
+                continue
+            checkpoint_job(job_key, "in_progress", {"id": job_id, "key": job_key, "search_url": search_url})
+            with job_metrics_context(job_key):
+                try:
+                    with timed_phase("card click"):
+                        page.goto(f"{search_url}&currentJobId={job_id}")
+                        wait_for_job_details(page, job_id)
+                    job_data = apply_to_open_job(page, file_id, job_key)
+                    if job_data:
+                        persist_job(job_data)
+                        results.append(job_data)
+                        print(f"[worker {worker_id}] Saved job {job_id}: {job_data['Job Title']} @ {job_data['Company Name']}")
+                    else:
+                        count_outcome("skipped", "not applicable")
+                        checkpoint_job(job_key, "skipped")
+                except Exception as e:
+                    print(f"[worker {worker_id}] Error processing job {job_id}: {e}")
+                    count_outcome("errored", type(e).__name__)
+                    checkpoint_job(job_key, "errored")
+        browser.close()
+
+def scrape_job_details_parallel(page, search_url, file_id, max_jobs=25, workers=APPLY_WORKERS):
+    ensure_application_log()
+    job_ids = collect_job_ids(page, max_jobs)
+    if not job_ids:
+        print("No job cards found.")
+        return []
+    save_session_state(page.context)
+    job_queue = queue.Queue()
+    for job_id in job_ids:
+        job_queue.put(job_id)
+    processed_job_ids = set()
+    results = []
+    print(f"Applying to {len(job_ids)} jobs with {workers} workers.")
+    threads = [
+        threading.Thread(
+            target=run_apply_worker,
+            args=(n + 1, job_queue, search_url, file_id, processed_job_ids, results),
+            name=f"apply-worker-{n + 1}",
+        )
+        for n in range(min(workers, len(job_ids)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+DB_HOST = os.getenv("db_host", "localhost")
+DB_NAME = os.getenv("db_name", "postgres")      # your database name
+DB_USER = os.getenv("db_user", "postgres")      # your PostgreSQL username
+DB_PASS = os.getenv("db_password", "2312")      # your PostgreSQL password
+DB_POOL_MAX_CONNECTIONS = int(os.getenv("db_pool_max_connections", 4))
+DB_FLUSH_EVERY_JOBS = int(os.getenv("db_flush_every_jobs", 5))
+DB_FLUSH_INTERVAL_SECONDS = float(os.getenv("db_flush_interval_seconds", 30))
+DB_BATCH_MAX_ATTEMPTS = int(os.getenv("db_batch_max_attempts", 3))
+
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+_pg_schema_ready = False
+_pg_queue = queue.Queue()
+_pg_writer_thread = None
+_PG_STOP = object()
+
+def get_postgres_pool():
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+
+            _pg_pool = ThreadedConnectionPool(
+                1, DB_POOL_MAX_CONNECTIONS,
+                host=DB_HOST,
+                dbname=DB_NAME,
+                user=DB_USER,
+                password=DB_PASS
             )
+        return _pg_pool
+
+def ensure_postgres_schema(cursor):
+    # (profile, job_key) makes re-runs idempotent: the same posting is updated instead of inserted
+    # twice, while different profiles applying to one posting keep a row each. Runs in the caller's
+    # transaction, which marks the schema ready once it commits
+    if _pg_schema_ready:
+        return
+    # ALTER TABLE locks the table even when there is nothing to add, so parallel profile processes
+    # only run the DDL on a database that has never been migrated
+    cursor.execute("SELECT to_regclass('linkedin_jobs_profile_job_key_idx') IS NOT NULL")
+    if cursor.fetchone()[0]:
+        return
+    cursor.execute("ALTER TABLE linkedin_jobs ADD COLUMN IF NOT EXISTS job_key TEXT")
+    cursor.execute("ALTER TABLE linkedin_jobs ADD COLUMN IF NOT EXISTS profile TEXT NOT NULL DEFAULT 'default'")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS linkedin_jobs_profile_job_key_idx ON linkedin_jobs (profile, job_key)"
+    )
 
-            cursor.execute(
+def _postgres_row(job):
+    # Normalize form responses
+    responses = job.get("Form Responses", {})
+    normalized_responses = {
+        label: (answer if answer and str(answer).strip() else "Not answered")
+        for label, answer in responses.items()
+    }
+    return (
+        PROFILE_NAME,
+        job.get("Job Key"),
+        job.get("Job Title", "N/A"),
+        job.get("Company Name", "N/A"),
+        job.get("Location", "N/A"),
+        job.get("Job Description", "N/A"),
+        json.dumps(normalized_responses, ensure_ascii=False),
+    )
+
+def save_job_to_postgres(jobs):
+    # One multi-row upsert per batch over a pooled connection; returns False when the write failed
+    global _pg_schema_ready
+    from psycopg2.extras import execute_values
+
+    # If single dict → wrap into a list
+    if isinstance(jobs, dict):
+        jobs = [jobs]
+    if not jobs:
+        return True
+
+    # ON CONFLICT can't touch the same row twice in one statement, so keep the last copy per key
+    rows_by_key = {}
+    for idx, job in enumerate(jobs):
+        row = _postgres_row(job)
+        rows_by_key[row[1] or f"__unkeyed_{idx}"] = row
+    rows = list(rows_by_key.values())
+
+    conn = None
+    pool = None
+    try:
+        pool = get_postgres_pool()
+        conn = pool.getconn()
+        with conn.cursor() as cursor:
+            ensure_postgres_schema(cursor)
+            execute_values(
+                cursor,
                 """
-                INSERT INTO linkedin_jobs (job_title, company_name, location, job_description, form_responses)
-                VALUES (%s, %s, %s, %s, %s)
+                INSERT INTO linkedin_jobs (profile, job_key, job_title, company_name, location, job_description, form_responses)
+                VALUES %s
+                ON CONFLICT (profile, job_key) DO UPDATE SET
+                    job_title = EXCLUDED.job_title,
+                    company_name = EXCLUDED.company_name,
+                    location = EXCLUDED.location,
+                    job_description = EXCLUDED.job_description,
+                    form_responses = EXCLUDED.form_responses
                 """,
-                (
-                    job.get("Job Title", "N/A"),
-                    job.get("Company Name", "N/A"),
-                    job.get("Location", "N/A"),
-                    job.get("Job Description", "N/A"),
-                    form_responses_json,
-                )
+                rows,
+                page_size=500,
             )
-
-            print(f"Saved job: {job.get('Job Title')} with {len(normalized_responses)} labels")
-
         conn.commit()
-        cursor.close()
-        conn.close()
-
+        _pg_schema_ready = True
+        print(f"Saved {len(rows)} jobs to Postgres.")
+        return True
     except Exception as e:
+        if conn is not None:
+            conn.rollback()
         print(f"Error saving job: {e}")
+        return False
+    finally:
+        if conn is not None:
+            pool.putconn(conn)
+
+def _save_jobs_one_by_one(jobs):
+    # Isolates the rows that keep a batch from being written; they are logged and dropped
+    for job in jobs:
+        if not save_job_to_postgres(job):
+            print(f"Dropping job '{job.get('Job Title')}' ({job.get('Job Key')}): it can't be written to Postgres.")
+
+def _postgres_writer_loop():
+    batch = []
+    failures = 0
+    last_flush = time.time()
+    while True:
+        timeout = max(0.1, DB_FLUSH_INTERVAL_SECONDS - (time.time() - last_flush))
+        try:
+            item = _pg_queue.get(timeout=timeout)
+        except queue.Empty:
+            item = None
+        stopping = item is _PG_STOP
+        if item is not None and not stopping:
+            batch.append(item)
+        due = len(batch) >= DB_FLUSH_EVERY_JOBS or time.time() - last_flush >= DB_FLUSH_INTERVAL_SECONDS
+        if batch and (due or stopping):
+            with timed_phase("db write"):
+                saved = save_job_to_postgres(batch)
+            # A failed batch stays queued and is retried on the next flush, up to DB_BATCH_MAX_ATTEMPTS
+            # times; after that (or at shutdown) it is written row by row so one bad row can't hold it
+            failures = 0 if saved else failures + 1
+            if not saved and (failures >= DB_BATCH_MAX_ATTEMPTS or stopping):
+                print(f"Batch of {len(batch)} jobs failed {failures} times; writing them one by one.")
+                _save_jobs_one_by_one(batch)
+                saved, failures = True, 0
+            if saved:
+                batch = []
+            last_flush = time.time()
+        elif not batch:
+            last_flush = time.time()
+        if stopping:
+            return
+
+def start_postgres_writer():
+    global _pg_writer_thread
+    if _pg_writer_thread is None or not _pg_writer_thread.is_alive():
+        _pg_writer_thread = threading.Thread(target=_postgres_writer_loop, name="postgres-writer", daemon=True)
+        _pg_writer_thread.start()
+
+def enqueue_job_for_postgres(job):
+    # Jobs are written in the background every DB_FLUSH_EVERY_JOBS jobs or DB_FLUSH_INTERVAL_SECONDS
+    if _pg_writer_thread is None or not _pg_writer_thread.is_alive():
+        start_postgres_writer()
+    _pg_queue.put(job)
+
+def stop_postgres_writer():
+    global _pg_writer_thread
+    if _pg_writer_thread is None:
+        return
+    _pg_queue.put(_PG_STOP)
+    _pg_writer_thread.join()
+    _pg_writer_thread = None
+
+# Multi-profile runs: every profile is a separate process running main() with its own settings,
+# browser and local state, so candidates never share a session, answer cache or checkpoint.
+# Applications from all profiles land in the shared Postgres table tagged with the profile name.
+PROFILE_STATE_FILES = {
+    "storage_state_path": "linkedin_state.json",
+    "answer_cache_path": "answer_cache.db",
+    "job_index_path": "job_index.db",
+    "application_log_path": "application_log.jsonl",
+    "checkpoint_path": "run_checkpoint.json",
+    "metrics_path": "run_metrics.jsonl",
+    # A warm browser is logged in as one account, so each profile only attaches to its own
+    "browser_daemon_state_path": "browser_daemon.json",
+    "browser_profile_dir": "browser_profile",
+}
+
+def load_profiles(path):
+    """
+    Reads a JSON list of profiles (or {"profiles": [...]}). Each profile needs a unique "name";
+    every other key is a setting of this script (LINKEDIN_USERNAME, resume_path,
+    resume_text_path, user_name, search_titles, max_jobs_per_run, ...). Lists are joined with
+    commas, and anything a profile leaves out falls back to .env.
+    """
+    with open(path, encoding="utf-8") as file:
+        profiles = json.load(file)
+    if isinstance(profiles, dict):
+        profiles = profiles.get("profiles", [])
+    names = set()
+    for profile in profiles:
+        name = str(profile.get("name") or "")
+        if not re.fullmatch(r"[\w.-]+", name):
+            raise ValueError(f"Profile name must be letters, digits, '.', '-' or '_': {name!r}")
+        if name in names:
+            raise ValueError(f"Duplicate profile name {name!r}")
+        names.add(name)
+    return profiles
+
+def profile_environment(profile):
+    state_dir = os.path.join(PROFILES_STATE_DIR, profile["name"])
+    os.makedirs(state_dir, exist_ok=True)
+    env = dict(os.environ)
+    env.update({key: os.path.join(state_dir, filename) for key, filename in PROFILE_STATE_FILES.items()})
+    env["metrics_port"] = "0"  # profiles would all try to bind the same port
+    for key, value in profile.items():
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, (list, tuple)):
+            value = ",".join(str(item) for item in value)
+        env[key] = str(value)
+    env["profile_name"] = profile["name"]
+    return env
+
+def profile_outcomes(job_index_path, since):
+    if not os.path.exists(job_index_path):
+        return {}
+    conn = sqlite3.connect(job_index_path)
+    try:
+        rows = conn.execute(
+            "SELECT status, COUNT(*) FROM seen_jobs WHERE seen_at >= ? GROUP BY status", (since,)
+        ).fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        conn.close()
+    return dict(rows)
+
+def run_profile_process(profile, extra_args=()):
+    name = profile["name"]
+    env = profile_environment(profile)
+    started = time.time()
+    print(f"[{name}] starting")
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), *extra_args],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="replace", bufsize=1,
+    )
+    # Interleaved output from several profiles stays readable with the profile name in front
+    for line in process.stdout:
+        print(f"[{name}] {line.rstrip()}", flush=True)
+    exit_code = process.wait()
+    return {
+        "profile": name,
+        "exit_code": exit_code,
+        "seconds": time.time() - started,
+        "outcomes": profile_outcomes(env["job_index_path"], started),
+    }
+
+def run_profiles(profiles_path="profiles.json", max_parallel=None, resume=False):
+    profiles = load_profiles(profiles_path)
+    if not profiles:
+        print(f"No profiles in {profiles_path}.")
+        return []
+    # Each profile drives a whole Chromium, so by default only half the cores run one at a time
+    limit = max_parallel or PROFILE_CONCURRENCY or max(1, (os.cpu_count() or 2) // 2)
+    limit = min(limit, len(profiles))
+    print(f"Running {len(profiles)} profiles, {limit} at a time.")
+    extra_args = ["apply", "--resume"] if resume else ["apply"]
+    executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="profile")
+    futures = [executor.submit(run_profile_process, profile, extra_args) for profile in profiles]
+    results = []
+    try:
+        for future in futures:
+            results.append(future.result())
+    except KeyboardInterrupt:
+        # Ctrl-C also reaches the running profiles, which checkpoint and exit on their own
+        print("Interrupted — not starting the remaining profiles.")
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown()
+    print("Profile results:")
+    for result in results:
+        outcomes = ", ".join(f"{status} {count}" for status, count in sorted(result["outcomes"].items()))
+        state = "ok" if result["exit_code"] == 0 else f"exit code {result['exit_code']}"
+        print(f"  {result['profile']:<20} {state:<14} {result['seconds']:>7.0f}s  {outcomes or 'no jobs'}")
+    return results
+
+def discover_jobs(limit=25, json_path=None):
+    # Dry run of the search side: guest search, dedup against the job index and ranking, no browser
+    if not SEARCH_TITLES or not SEARCH_LOCATIONS:
+        print("Set search_titles and search_locations (or target_job_title and target_location) first.")
+        return []
+    cards = sweep_job_cards()
+    candidates = filter_new_candidates(cards)
+    if JOB_RANKING:
+        candidates = rank_in_windows(candidates)
+    jobs = []
+    try:
+        for card in candidates:
+            job = {field: card.get(field) for field in ("id", "title", "company", "location", "score")}
+            job["url"] = f"https://www.linkedin.com/jobs/view/{card['id']}/"
+            jobs.append(job)
+            score = f"{job['score']:.2f}" if job["score"] is not None else "-"
+            print(f"{len(jobs):>3}. [{score}] {job['title']} @ {job['company']} ({job['location']}) {job['url']}")
+            if len(jobs) >= limit:
+                break
+    finally:
+        cards.close()
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(jobs, file, ensure_ascii=False, indent=2)
+        print(f"Wrote {len(jobs)} jobs to {json_path}.")
+    return jobs
+
+def export_application_log(output="-", fmt="csv", since=None):
+    entries, _ = read_application_log(since=since)
+    file = sys.stdout if output == "-" else open(output, "w", newline="", encoding="utf-8")
+    try:
+        if fmt == "json":
+            json.dump(entries, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+        else:
+            writer = csv.DictWriter(file, fieldnames=APPLICATION_LOG_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for entry in entries:
+                writer.writerow({**entry, "form_responses": json.dumps(entry.get("form_responses") or {}, ensure_ascii=False)})
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    if output != "-":
+        print(f"Exported {len(entries)} applications to {output}.")
+    return len(entries)
+
+def check_resume():
+    """
+    Offline check of the resume inputs: what the fact index and the section index extract from
+    the resume text, whether the upload file exists and whether an upload and a summary are
+    already cached for it. Makes no LLM or upload calls; returns False when something is missing.
+    """
+    ok = True
+    try:
+        text = get_resume_text()
+    except OSError as e:
+        print(f"Resume text {RESUME_TEXT_PATH}: {e}")
+        return False
+    print(f"Resume text: {RESUME_TEXT_PATH} ({len(text)} chars, hash {get_resume_hash()[:12]})")
+    print("Sections: " + (", ".join(name for name, _, _ in get_resume_section_index()) or "none found"))
+    facts = get_resume_facts()
+    contact = ", ".join(f"{key}={value}" for key, value in facts["contact"].items())
+    print(f"Contact facts: {contact or 'none found'}")
+    print(f"Skills with dated experience: {len(facts['skills'])}")
+    if not facts["contact"].get("email") or not facts["contact"].get("phone"):
+        print("Warning: no email or phone found; those questions will go to the LLM.")
+    if not RESUME_PATH:
+        print("resume_path is not set; the resume file can't be attached.")
+    elif not os.path.exists(RESUME_PATH):
+        print(f"Resume file {RESUME_PATH} does not exist.")
+        ok = False
+    else:
+        with open(RESUME_PATH, "rb") as file:
+            file_id = lookup_uploaded_file(hashlib.sha256(file.read()).hexdigest())
+        print(f"Resume file: {RESUME_PATH} ({'uploaded as ' + file_id if file_id else 'not uploaded yet'})")
+    with _answer_cache_lock:
+        summary = get_answer_cache().execute(
+            "SELECT summary FROM resume_summaries WHERE resume_hash = ? AND model = ?",
+            (get_resume_hash(), OPENWEBUI_MODEL),
+        ).fetchone()
+    print(f"Cached summary for {OPENWEBUI_MODEL}: {summary[0] if summary else 'none yet (made on the first run)'}")
+    return ok
+
+def main(resume=False, max_jobs=None):
+    checkpoint = load_checkpoint() if resume else None
+    if resume and checkpoint is None:
+        print("No checkpoint to resume — starting a fresh run.")
+    elif checkpoint and checkpoint["status"] == "completed":
+        print(f"Run {checkpoint['run_id']} already completed; nothing to resume.")
+        return
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    from playwright.sync_api import sync_playwright
 
-def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        login_to_linkedin(page)
-        search_linkedin_jobs_with_combined_input(page, TARGET_JOB_TITLE, TARGET_LOCATION)
-        file_id = upload_resume_get_file_id(RESUME_PATH)
-        scroll_job_list(page, target_count=25)
-        jobs = scrape_job_details(page, file_id, max_jobs=25)
-        print("DEBUG JOB BEFORE SAVE:", jobs)
-        save_job_to_postgres(jobs)
+        context, warm = open_linkedin_context(p)
+        page = context.new_page()
+        ensure_logged_in(page)
+        start_postgres_writer()
+        try:
+            file_id = None
+            if LLM_ATTACH_RESUME_FILE:
+                with timed_phase("resume upload"):
+                    file_id = upload_resume_get_file_id(RESUME_PATH)
+            mode = checkpoint["mode"] if checkpoint else ("sweep" if SEARCH_SWEEP else "list")
+            if checkpoint:
+                resumed_cards = checkpoint_resume_cards()
+                max_jobs = checkpoint_remaining_budget()
+                print(f"Resuming run {checkpoint['run_id']}: {len(resumed_cards)} unfinished jobs, {max_jobs} left in the budget.")
+            else:
+                resumed_cards = []
+                max_jobs = max_jobs or (MAX_JOBS_PER_RUN if mode == "sweep" else 25)
+                search = {} if mode == "sweep" else {"title": TARGET_JOB_TITLE, "location": TARGET_LOCATION}
+                start_checkpoint(mode, search, max_jobs)
+            # Results stream out as they finish; nothing is collected for the end of the run
+            if mode == "sweep":
+                cards = sweep_job_cards(checkpoint["cursor"] if checkpoint else None)
+                processed = sum(1 for _ in run_job_pipeline(page, file_id, cards, max_jobs, resumed_cards))
+            elif APPLY_WORKERS > 1 and not checkpoint:
+                search_linkedin_jobs_with_combined_input(page, TARGET_JOB_TITLE, TARGET_LOCATION)
+                scroll_job_list(page, target_count=25)
+                search_url = build_job_search_url(TARGET_JOB_TITLE, TARGET_LOCATION)
+                processed = len(scrape_job_details_parallel(page, search_url, file_id, max_jobs=max_jobs))
+            else:
+                search_linkedin_jobs_with_combined_input(page, TARGET_JOB_TITLE, TARGET_LOCATION)
+                cards = discover_job_cards(page)
+                processed = sum(1 for _ in run_job_pipeline(page, file_id, cards, max_jobs, resumed_cards))
+            finish_checkpoint()
+            print(f"Processed {processed} jobs this run.")
+        finally:
+            # Whatever was applied before a crash or Ctrl-C still reaches Postgres
+            stop_postgres_writer()
+        print_answer_cache_stats()
+        print_run_summary()
+        save_session_state(context)
+        if warm:
+            # The warm browser outlives this run; only the page opened for it goes away
+            page.close()
     # browser.close()
 
+def cli(argv=None):
+    import argparse
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["bench"]:
+        # Options belong to bench/run_benchmark.py; `bench --help` lists them
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench"))
+        from run_benchmark import run_benchmarks
+
+        return run_benchmarks(argv[1:])
+
+    def since_time(value):
+        try:
+            return parse_log_time(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from None
+
+    parser = argparse.ArgumentParser(description="LinkedIn Easy Apply automation")
+    commands = parser.add_subparsers(dest="command")
+    apply = commands.add_parser("apply", help="search and apply (the default)")
+    apply.add_argument("--resume", action="store_true", help="continue the last interrupted run")
+    apply.add_argument("--max-jobs", type=int, help="jobs to process this run")
+    discover = commands.add_parser("discover", help="list new matching jobs without a browser")
+    discover.add_argument("--limit", type=int, default=25)
+    discover.add_argument("--json", help="also write the jobs to this file")
+    export = commands.add_parser("export", help="export the application log")
+    export.add_argument("--format", choices=["csv", "json"], default="csv")
+    export.add_argument("--since", type=since_time, help="ISO date, date/time or epoch seconds")
+    export.add_argument("--output", default="-", help="file to write (default: stdout)")
+    commands.add_parser("bench", help="offline benchmarks against local fixtures (see bench --help)")
+    commands.add_parser("resume-check", help="show what is extracted from the resume, offline")
+    commands.add_parser("daemon", help="keep a logged-in browser running for later runs")
+    profiles = commands.add_parser("profiles", help="run several profiles as separate processes")
+    profiles.add_argument("path", nargs="?", default="profiles.json")
+    profiles.add_argument("--max-parallel", type=int)
+    profiles.add_argument("--resume", action="store_true")
+    migrate = commands.add_parser("migrate-log", help="convert the legacy CSV log to JSON lines")
+    migrate.add_argument("csv_path", nargs="?", help="legacy CSV log (default: log_file_path, then application_log.csv)")
+    migrate.add_argument("jsonl_path", nargs="?")
+    # No subcommand (or just `--resume`) still means apply
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv = ["apply", *argv]
+    args = parser.parse_args(argv)
+
+    if args.command == "apply":
+        return main(resume=args.resume, max_jobs=args.max_jobs)
+    if args.command == "discover":
+        return discover_jobs(args.limit, args.json)
+    if args.command == "export":
+        return export_application_log(args.output, args.format, args.since)
+    if args.command == "resume-check":
+        if not check_resume():
+            sys.exit(1)
+        return True
+    if args.command == "daemon":
+        return run_browser_daemon()
+    if args.command == "profiles":
+        return run_profiles(args.path, args.max_parallel, args.resume)
+    return migrate_csv_application_log(args.csv_path, args.jsonl_path)
+
 if __name__ == "__main__":
-    main()
+    cli()
 
 
 
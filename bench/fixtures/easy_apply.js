@@ -0,0 +1,137 @@
+// Recorded shape of LinkedIn's Easy Apply modal: the same class names, labels and buttons the
+// automation looks for, with a short busy state between steps like the real page.
+(function () {
+  const params = new URLSearchParams(location.search);
+  const STEP_MS = Number(params.get('step_ms') || 250);
+  const TYPEAHEAD_MS = Number(params.get('typeahead_ms') || 150);
+  const CITIES = ['Bengaluru, Karnataka, India', 'Bengaluru East, Karnataka, India', 'Bengaluru Rural, Karnataka, India'];
+
+  const STEPS = [
+    {
+      heading: 'Contact info',
+      button: 'Next',
+      body: `
+        <div><label for="first-name">First name</label><input id="first-name" type="text" value="Nitesh"></div>
+        <div><label for="phone">Mobile phone number</label><input id="phone" type="text"></div>
+        <div><label for="email">Email address</label>
+          <select id="email"><option>Select an option</option><option>niteshtheceo@gmail.com</option></select></div>`,
+    },
+    {
+      heading: 'Additional questions',
+      button: 'Next',
+      body: `
+        <div><label for="python-years">How many years of work experience do you have with Python?</label><input id="python-years" type="text"></div>
+        <fieldset><legend><span>Are you legally authorized to work in this country?</span></legend>
+          <div><input id="auth-yes" type="radio" name="auth" value="Yes"><label for="auth-yes">Yes</label></div>
+          <div><input id="auth-no" type="radio" name="auth" value="No"><label for="auth-no">No</label></div>
+        </fieldset>
+        <div class="typeahead"><label for="city">Location (city)</label><input id="city" type="text" role="combobox" autocomplete="off"></div>`,
+    },
+    {
+      heading: 'Job search safety reminder',
+      button: 'Continue applying',
+      body: `<p>Be cautious of employers asking for payment or personal financial information.</p>`,
+    },
+    {
+      heading: 'Work experience',
+      button: 'Review',
+      body: `
+        <div><label for="education">What is your highest level of education?</label>
+          <select id="education"><option>Select an option</option><option>High school</option>
+          <option>Bachelor's Degree</option><option>Master's Degree</option></select></div>
+        <div><label for="summary">Why are you a good fit for this role?</label><textarea id="summary"></textarea></div>`,
+    },
+    {
+      heading: 'Review your application',
+      button: 'Submit application',
+      body: `<p>The employer will also receive a copy of your profile.</p>`,
+    },
+    {
+      heading: 'Your application was sent',
+      button: 'Done',
+      body: `<p>You can keep track of your application in My Jobs.</p>`,
+    },
+  ];
+
+  function renderStep(modal, index) {
+    const step = STEPS[index];
+    const progress = Math.round((index / (STEPS.length - 2)) * 100);
+    modal.querySelector('.jobs-easy-apply-content').innerHTML = `
+      <h3>${step.heading}</h3>
+      <div role="progressbar">${Math.min(progress, 100)}%</div>
+      <form>${step.body}</form>
+      <footer><button type="button" class="artdeco-button artdeco-button--primary" data-step-button>${step.button}</button></footer>`;
+    modal.dataset.step = String(index);
+    const button = modal.querySelector('[data-step-button]');
+    button.addEventListener('click', () => advance(modal, index));
+    const city = modal.querySelector('#city');
+    if (city) attachTypeahead(city);
+  }
+
+  function advance(modal, index) {
+    if (STEPS[index].button === 'Done') {
+      modal.remove();
+      return;
+    }
+    modal.setAttribute('aria-busy', 'true');
+    setTimeout(() => {
+      modal.removeAttribute('aria-busy');
+      renderStep(modal, index + 1);
+    }, STEP_MS);
+  }
+
+  function attachTypeahead(input) {
+    let list = null;
+    let active = -1;
+    const close = () => { if (list) list.remove(); list = null; active = -1; };
+    input.addEventListener('input', () => {
+      close();
+      const text = input.value.trim().toLowerCase();
+      if (!text) return;
+      setTimeout(() => {
+        if (input.value.trim().toLowerCase() !== text) return;
+        list = document.createElement('div');
+        list.setAttribute('role', 'listbox');
+        list.innerHTML = CITIES.map(city => `<div role="option">${city}</div>`).join('');
+        input.parentElement.appendChild(list);
+      }, TYPEAHEAD_MS);
+    });
+    input.addEventListener('keydown', (event) => {
+      if (!list) return;
+      const options = [...list.querySelectorAll('[role="option"]')];
+      if (event.key === 'ArrowDown') {
+        active = Math.min(active + 1, options.length - 1);
+        options.forEach((option, i) => option.setAttribute('aria-selected', String(i === active)));
+      } else if (event.key === 'Enter' && active >= 0) {
+        event.preventDefault();
+        input.value = options[active].textContent;
+        close();
+      }
+    });
+  }
+
+  function confirmDiscard(modal) {
+    const dialog = document.createElement('div');
+    dialog.className = 'artdeco-modal';
+    dialog.innerHTML = `<h2>Save this application?</h2>
+      <button type="button" data-discard>Discard</button><button type="button">Save</button>`;
+    dialog.querySelector('[data-discard]').addEventListener('click', () => {
+      dialog.remove();
+      modal.remove();
+    });
+    document.body.appendChild(dialog);
+  }
+
+  window.openEasyApplyModal = function () {
+    document.querySelector('div.jobs-easy-apply-modal')?.remove();
+    const modal = document.createElement('div');
+    modal.className = 'jobs-easy-apply-modal artdeco-modal';
+    modal.setAttribute('role', 'dialog');
+    modal.innerHTML = `<button type="button" aria-label="Dismiss">×</button>
+      <div class="jobs-easy-apply-content"></div>`;
+    modal.querySelector('button[aria-label="Dismiss"]').addEventListener('click', () => confirmDiscard(modal));
+    document.body.appendChild(modal);
+    renderStep(modal, 0);
+    return modal;
+  };
+})();
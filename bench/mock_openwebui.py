@@ -0,0 +1,165 @@
+"""
+Local stand-in for the OpenWebUI endpoints the automation calls: POST /api/v1/files/,
+GET /api/v1/files/<id> and POST /api/chat/completions. Each completion sleeps for the
+configured latency, then answers from simple keyword rules. Batch prompts get a JSON object
+keyed by question number, exactly like the real model is asked to reply. Requests with
+"stream": true get server-sent events: the first token after the latency, then one word every
+--token-ms, like a model generating.
+
+    python bench/mock_openwebui.py --port 8765 --latency-ms 800 --token-ms 40
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUESTION_LINE = re.compile(r"^(\d+)\. \[(\w+)\] (.*?)(?: Options: (.*))?$")
+
+
+def canned_answer(question, options=None):
+    lowered = question.lower()
+    if options:
+        for option in options:
+            if option.lower() in ("yes", "bachelor's degree"):
+                return option
+        return options[-1]
+    if "years" in lowered:
+        return "2"
+    if "phone" in lowered:
+        return "9902972191"
+    if "why" in lowered or "describe" in lowered:
+        return "My Python and machine learning projects match the requirements of this role."
+    if any(word in lowered for word in ("authorized", "willing", "comfortable", "relocate")):
+        return "Yes"
+    return "Bengaluru" if "city" in lowered or "location" in lowered else "Yes"
+
+
+def answer_prompt(content):
+    if content.startswith("Summarize this resume"):
+        return ("Nitesh R, Bengaluru. Computer Science graduate with Python development and AI/ML "
+                "internships at Coders Boutique and IBM. Skills: Python, SQL, Pandas, Scikit-learn, "
+                "TensorFlow, OpenCV. B.E. in Computer Science & Engineering.")
+    if "\nQuestions:\n" in content:
+        answers = {}
+        for line in content.split("\nQuestions:\n", 1)[1].splitlines():
+            match = QUESTION_LINE.match(line.strip())
+            if match:
+                options = match.group(4).split(" | ") if match.group(4) else None
+                answers[match.group(1)] = canned_answer(match.group(3), options)
+        return json.dumps(answers)
+    question = content.rsplit("Question:", 1)[-1].strip()
+    return canned_answer(question)
+
+
+class MockOpenWebUI:
+    def __init__(self, port=0, latency_ms=800, jitter_ms=0, token_ms=20):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.token_ms = token_ms
+        self.lock = threading.Lock()
+        self.stats = {"uploads": 0, "completions": 0, "prompt_chars": 0}
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def reset_stats(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def snapshot_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-openwebui", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            protocol_version = "HTTP/1.1"  # chunked event streams, as served by uvicorn
+
+            def _write_chunk(self, data):
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, answer):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for index, token in enumerate(re.findall(r"\S+\s*|\s+", answer)):
+                        if index:
+                            time.sleep(mock.token_ms / 1000)
+                        event = {"choices": [{"delta": {"content": token}}]}
+                        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # the client stopped reading once it had its answer
+
+            def do_GET(self):
+                if self.path.startswith("/api/v1/files/"):
+                    self._reply({"id": self.path.rstrip("/").rsplit("/", 1)[-1]})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path.rstrip("/") == "/api/v1/files":
+                    with mock.lock:
+                        mock.stats["uploads"] += 1
+                    self._reply({"id": "bench-resume-file"})
+                elif self.path == "/api/chat/completions":
+                    payload = json.loads(body)
+                    content = payload["messages"][-1]["content"]
+                    with mock.lock:
+                        mock.stats["completions"] += 1
+                        mock.stats["prompt_chars"] += len(content)
+                    delay = mock.latency_ms + random.uniform(0, mock.jitter_ms)
+                    time.sleep(delay / 1000)
+                    if payload.get("stream"):
+                        self._stream(answer_prompt(content))
+                    else:
+                        self._reply({"choices": [{"message": {"role": "assistant", "content": answer_prompt(content)}}]})
+                else:
+                    self.send_error(404)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenWebUI server for offline benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--token-ms", type=float, default=20)
+    args = parser.parse_args()
+    server = MockOpenWebUI(args.port, args.latency_ms, args.jitter_ms, args.token_ms)
+    print(f"Mock OpenWebUI on {server.url} ({args.latency_ms:.0f} ms per completion)")
+    server.server.serve_forever()
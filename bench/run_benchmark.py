@@ -0,0 +1,238 @@
+"""
+Offline benchmarks: drives the real automation code against the HTML fixtures in
+bench/fixtures (served locally) and the mock OpenWebUI server, so nothing needs a LinkedIn
+account or a model. Each scenario is repeated and reported as min/median/max wall time, plus
+Playwright protocol calls (every round trip to the browser driver) and LLM calls.
+
+    python bench/run_benchmark.py                       # every scenario, 3 rounds
+    python bench/run_benchmark.py --scenario form --llm-latency-ms 2000 --rounds 5
+    python bench/run_benchmark.py --json bench_results.json
+
+Scenarios:
+    scroll    scroll_job_list over a lazily loading list of --cards cards
+    form      extract_and_fill_form_fields_across_steps through the five-step modal
+    pipeline  run_job_pipeline end to end (discover, filter, rank, apply, persist) for --jobs jobs
+"""
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+SCENARIOS = ["scroll", "form", "pipeline"]
+
+protocol_calls = {"count": 0}
+
+
+def count_protocol_calls():
+    # Every sync Playwright call is one or more messages to the driver; counting them at the
+    # connection shows how many browser round trips a code path costs.
+    from playwright._impl import _connection
+
+    original = _connection.Connection._send_message_to_server
+
+    @functools.wraps(original)
+    def counting_send(self, *args, **kwargs):
+        protocol_calls["count"] += 1
+        return original(self, *args, **kwargs)
+
+    _connection.Connection._send_message_to_server = counting_send
+
+
+class QuietFixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuietFixtureHandler)
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def configure_environment(mock_url, state_dir):
+    # Read once when the automation module is imported, so this must run first. A profile name
+    # makes these settings win over a developer's .env, which must never point the bench at the
+    # real log, caches or LLM server
+    os.environ.update({
+        "profile_name": "bench",
+        "OPENWEBUI_API_URL": mock_url,
+        "OPENWEBUI_API_KEY": "bench",
+        "resume_path": os.path.join(REPO_DIR, "resume.txt"),
+        "answer_cache_path": os.path.join(state_dir, "answer_cache.db"),
+        "job_index_path": os.path.join(state_dir, "job_index.db"),
+        "application_log_path": os.path.join(state_dir, "application_log.jsonl"),
+        "storage_state_path": os.path.join(state_dir, "linkedin_state.json"),
+        "metrics_path": "",
+        "pacing_min_seconds": "0",
+        "pacing_max_seconds": "0",
+        "apply_min_interval_seconds": "0",
+        "job_details_prefetch": "false",
+        "relevance_min_score": "0",
+        "dom_wait_timeout_ms": "10000",
+    })
+
+
+def import_automation():
+    sys.path.insert(0, REPO_DIR)
+    os.chdir(REPO_DIR)  # the module reads resume.txt relative to the repo
+    import Linkdin_Automation_Project as automation
+
+    # Jobs are measured up to the Postgres queue; the database itself is not part of the run
+    automation.enqueue_job_for_postgres = lambda job: None
+    return automation
+
+
+def reset_state(automation, warm_cache):
+    if not warm_cache:
+        with automation._answer_cache_lock:
+            automation.get_answer_cache().execute("DELETE FROM answer_cache")
+            automation.get_answer_cache().commit()
+        # The in-memory layers in front of the cache would otherwise still answer from the last run
+        with automation._reworded_index_lock:
+            automation._reworded_index = None
+            automation._reworded_labels.clear()
+        with automation._option_decisions_lock:
+            automation._option_decisions.clear()
+        with automation._label_classes_lock:
+            automation._label_classes.clear()
+    with automation._job_index_lock:
+        automation.get_job_index().execute("DELETE FROM seen_jobs")
+        automation.get_job_index().commit()
+    open(automation.APPLICATION_LOG_PATH, "w").close()
+
+
+def run_scenario(name, automation, page, fixtures_url, mock, file_id, args):
+    if name == "scroll":
+        page.goto(f"{fixtures_url}/jobs.html?cards={args.cards}&lazy_ms={args.lazy_ms}")
+    elif name == "form":
+        page.goto(f"{fixtures_url}/modal.html?step_ms={args.step_ms}")
+        page.wait_for_selector("div.jobs-easy-apply-modal")
+    else:
+        page.goto(
+            f"{fixtures_url}/jobs.html?cards={args.cards}&lazy_ms={args.lazy_ms}"
+            f"&detail_ms={args.detail_ms}&step_ms={args.step_ms}"
+        )
+    mock.reset_stats()
+    calls_before = protocol_calls["count"]
+    start = time.perf_counter()
+    applications = 0
+    if name == "scroll":
+        automation.scroll_job_list(page, target_count=args.cards)
+        detail = f"{len(page.query_selector_all('div.job-card-container'))} cards loaded"
+    elif name == "form":
+        responses = {}
+        completed = automation.extract_and_fill_form_fields_across_steps(page, file_id, responses)
+        applications = 1
+        detail = f"{'completed' if completed else 'aborted'}, {len(responses)} fields"
+    else:
+        results = list(automation.run_job_pipeline(page, file_id, automation.discover_job_cards(page), args.jobs))
+        applications = len(results)
+        applied = sum(1 for job in results if job.get("Status") == "applied")
+        detail = f"{applied}/{applications} applied"
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "protocol_calls": protocol_calls["count"] - calls_before,
+        "llm_calls": mock.snapshot_stats()["completions"],
+        "applications": applications,
+        "detail": detail,
+    }
+
+
+def summarize(name, rounds):
+    times = [r["seconds"] for r in rounds]
+    per_application = [r["llm_calls"] / r["applications"] for r in rounds if r["applications"]]
+    return {
+        "scenario": name,
+        "rounds": len(rounds),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "max_s": max(times),
+        "protocol_calls": statistics.median(r["protocol_calls"] for r in rounds),
+        "llm_calls": statistics.median(r["llm_calls"] for r in rounds),
+        "llm_calls_per_application": statistics.median(per_application) if per_application else None,
+        "detail": rounds[-1]["detail"],
+    }
+
+
+def print_report(results, args):
+    print(f"\nBenchmark results ({args.rounds} rounds, mock LLM latency {args.llm_latency_ms:.0f} ms):")
+    print(f"{'scenario':<10}{'min s':>8}{'median s':>10}{'max s':>8}{'pw calls':>10}{'llm calls':>11}{'llm/app':>9}  detail")
+    for row in results:
+        per_app = f"{row['llm_calls_per_application']:.1f}" if row["llm_calls_per_application"] is not None else "-"
+        print(
+            f"{row['scenario']:<10}{row['min_s']:>8.2f}{row['median_s']:>10.2f}{row['max_s']:>8.2f}"
+            f"{row['protocol_calls']:>10.0f}{row['llm_calls']:>11.0f}{per_app:>9}  {row['detail']}"
+        )
+
+
+def run_benchmarks(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against local fixtures and a mock LLM")
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=0)
+    parser.add_argument("--llm-token-ms", type=float, default=20, help="delay between streamed tokens")
+    parser.add_argument("--cards", type=int, default=25)
+    parser.add_argument("--jobs", type=int, default=3)
+    parser.add_argument("--lazy-ms", type=int, default=300)
+    parser.add_argument("--detail-ms", type=int, default=200)
+    parser.add_argument("--step-ms", type=int, default=250)
+    parser.add_argument("--warm-cache", action="store_true", help="keep cached answers between rounds")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", help="also write the summary rows to this file")
+    args = parser.parse_args(argv)
+    if args.json:
+        args.json = os.path.abspath(args.json)  # the run switches to the repo directory
+
+    sys.path.insert(0, BENCH_DIR)
+    from mock_openwebui import MockOpenWebUI
+    from playwright.sync_api import sync_playwright
+
+    mock = MockOpenWebUI(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, token_ms=args.llm_token_ms).start()
+    fixture_server, fixtures_url = start_fixture_server()
+    state_dir = tempfile.mkdtemp(prefix="linkedin-bench-")
+    configure_environment(mock.url, state_dir)
+    automation = import_automation()
+    count_protocol_calls()
+
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+    results = []
+    try:
+        file_id = automation.upload_resume_get_file_id(automation.RESUME_PATH)
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=not args.headed)
+            page = browser.new_page()
+            for name in scenarios:
+                rounds = []
+                for round_number in range(args.rounds):
+                    reset_state(automation, args.warm_cache)
+                    rounds.append(run_scenario(name, automation, page, fixtures_url, mock, file_id, args))
+                    print(f"[{name}] round {round_number + 1}: {rounds[-1]['seconds']:.2f}s, {rounds[-1]['detail']}")
+                results.append(summarize(name, rounds))
+            browser.close()
+    finally:
+        fixture_server.shutdown()
+        mock.stop()
+
+    print_report(results, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -1,4 +1,89 @@
-export async function parseApplicationLog() {
+// The automation appends one JSON object per line to application_log.jsonl. We remember how
+// many bytes we've already parsed and ask only for the rest with a Range request, so a
+// dashboard refresh costs O(new rows) instead of re-downloading the whole log.
+const LOG_URL = '/application_log.jsonl';
+
+const logState = {
+  offset: 0,
+  applications: [],
+  // The offset is read before and advanced after an await, so overlapping reads (StrictMode's
+  // double effect, Dashboard and Applications mounting together) would append the same rows
+  // twice; callers that arrive while a read is running share its result instead
+  inFlight: null,
+};
+
+export function parseApplicationLog() {
+  if (!logState.inFlight) {
+    logState.inFlight = readNewLogRows().finally(() => {
+      logState.inFlight = null;
+    });
+  }
+  return logState.inFlight;
+}
+
+async function readNewLogRows() {
+  try {
+    const response = await fetch(LOG_URL, {
+      headers: logState.offset ? { Range: `bytes=${logState.offset}-` } : {},
+      cache: 'no-store',
+    });
+
+    if (response.status === 416) {
+      return logState.applications;
+    }
+    if (!response.ok) {
+      return parseLegacyCsvLog();
+    }
+    // Server ignored the Range header and sent the whole file: start over
+    if (response.status !== 206 && logState.offset) {
+      logState.offset = 0;
+      logState.applications = [];
+    }
+
+    const bytes = new Uint8Array(await response.arrayBuffer());
+    const lastNewline = bytes.lastIndexOf(10);
+    if (lastNewline === -1) {
+      return logState.applications;
+    }
+
+    // Only complete lines; a row still being written is picked up next time
+    const text = new TextDecoder().decode(bytes.subarray(0, lastNewline + 1));
+    logState.offset += lastNewline + 1;
+
+    for (const line of text.split('\n')) {
+      if (!line.trim()) continue;
+      try {
+        const entry = JSON.parse(line);
+        if (entry.job_title && entry.job_title !== 'N/A') {
+          logState.applications.push(toApplication(entry, logState.applications.length + 1));
+        }
+      } catch (error) {
+        console.error('Skipping corrupt log line:', error);
+      }
+    }
+
+    return logState.applications;
+  } catch (error) {
+    console.error('Error reading application log:', error);
+    return logState.applications;
+  }
+}
+
+function toApplication(entry, id) {
+  return {
+    id,
+    jobKey: entry.job_key,
+    jobTitle: entry.job_title,
+    company: entry.company_name,
+    location: entry.location,
+    description: entry.job_description,
+    formResponses: entry.form_responses || {},
+    appliedAt: entry.applied_at || new Date().toISOString(),
+    status: entry.status === 'applied' ? 'success' : 'failed',
+  };
+}
+
+async function parseLegacyCsvLog() {
   try {
     const response = await fetch('/application_log.csv');
     const text = await response.text();
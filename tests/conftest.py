@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_DIR = tempfile.mkdtemp(prefix="linkedin_tests_")
+
+# The automation module reads its settings once at import, so they are set before the first import
+os.environ.update({
+    "profile_name": "tests",  # keeps a developer's .env from overriding the paths below
+    "resume_path": os.path.join(REPO_DIR, "resume.txt"),
+    "answer_cache_path": os.path.join(STATE_DIR, "answer_cache.db"),
+    "job_index_path": os.path.join(STATE_DIR, "job_index.db"),
+    "application_log_path": os.path.join(STATE_DIR, "application_log.jsonl"),
+    "storage_state_path": os.path.join(STATE_DIR, "linkedin_state.json"),
+    "metrics_path": "",
+    "metrics_port": "0",
+})
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def automation():
+    import Linkdin_Automation_Project as automation
+
+    return automation
+
+
+@pytest.fixture
+def reworded_index(automation, monkeypatch):
+    # An empty in-memory index, so tests never load earlier answers from the cache
+    monkeypatch.setattr(automation, "_reworded_index", {})
+    monkeypatch.setattr(automation, "_reworded_labels", set())
+    monkeypatch.setattr(automation, "REWORDED_ANSWER_REUSE", True)
+    return automation
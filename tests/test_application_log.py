@@ -0,0 +1,39 @@
+import csv
+import json
+import os
+import time
+
+
+def write_legacy_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Job Title", "Company Name", "Location", "Job Description", "Form Responses"])
+        for row in rows:
+            writer.writerow(row)
+            writer.writerow(["-" * 20])
+
+
+def test_log_path_setting_is_separate_from_the_legacy_csv(automation):
+    assert automation.APPLICATION_LOG_PATH == os.environ["application_log_path"]
+    assert automation.LOG_FILE_PATH is None
+
+
+def test_migrated_rows_come_first_with_a_timestamp(automation, tmp_path, monkeypatch):
+    csv_path = tmp_path / "application_log.csv"
+    jsonl_path = tmp_path / "application_log.jsonl"
+    write_legacy_csv(csv_path, [["Old job", "Acme", "Pune", "Python", "{'Years of Python': '4'}"]])
+    csv_time = time.mktime(time.strptime("2026-03-01T12:00:00", "%Y-%m-%dT%H:%M:%S"))
+    os.utime(csv_path, (csv_time, csv_time))
+    jsonl_path.write_text(json.dumps({"job_title": "New job", "applied_at": "2026-02-01T09:00:00"}) + "\n")
+    monkeypatch.setattr(automation, "LOG_FILE_PATH", str(csv_path))
+
+    assert automation.migrate_csv_application_log(jsonl_path=str(jsonl_path)) == 1
+    entries, _ = automation.read_application_log(path=str(jsonl_path))
+    assert [entry["job_title"] for entry in entries] == ["Old job", "New job"]
+    # Stamped no later than the oldest existing row, so the file stays in time order
+    assert entries[0]["applied_at"].startswith("2026-02-01T09:00:00")
+    assert entries[0]["form_responses"] == {"Years of Python": "4"}
+
+    since = automation.parse_log_time("2026-01-15")
+    assert len(automation.read_application_log(since=since, path=str(jsonl_path))[0]) == 2
+    assert automation.migrate_csv_application_log(jsonl_path=str(jsonl_path)) == 0
@@ -0,0 +1,35 @@
+import json
+import time
+
+import pytest
+
+
+@pytest.fixture
+def application_log(automation, tmp_path, monkeypatch):
+    path = tmp_path / "application_log.jsonl"
+    with open(path, "w", encoding="utf-8") as file:
+        for day in ("2026-01-10", "2026-02-10", "2026-03-10"):
+            file.write(json.dumps({"job_title": day, "applied_at": f"{day}T09:30:00"}) + "\n")
+    monkeypatch.setattr(automation, "APPLICATION_LOG_PATH", str(path))
+    return path
+
+
+@pytest.mark.parametrize("since", [
+    "2026-02-01",
+    "2026-02-01T00:00:00",
+    "2026-02-01 00:00:00",
+    str(int(time.mktime(time.strptime("2026-02-01", "%Y-%m-%d")))),
+    str(time.mktime(time.strptime("2026-02-01", "%Y-%m-%d"))),
+])
+def test_export_since(automation, application_log, tmp_path, since):
+    output = tmp_path / "export.json"
+    automation.cli(["export", "--format", "json", "--since", since, "--output", str(output)])
+    titles = [entry["job_title"] for entry in json.loads(output.read_text(encoding="utf-8"))]
+    assert titles == ["2026-02-10", "2026-03-10"]
+
+
+@pytest.mark.parametrize("since", ["yesterday", "10/02/2026", ""])
+def test_export_rejects_unparseable_since(automation, application_log, since):
+    with pytest.raises(SystemExit) as exit_info:
+        automation.cli(["export", "--since", since])
+    assert exit_info.value.code == 2
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture
+def classify(automation, monkeypatch):
+    monkeypatch.setattr(automation, "_label_classes", {})
+    monkeypatch.setattr(automation, "_reworded_labels", set())
+    return automation.classify_label
+
+
+@pytest.mark.parametrize("label", [
+    "Degree",
+    "School",
+    "Proficiency",
+    "Back-end experience",
+    "Years of experience with React",
+    "Email",
+    "Have you completed the following level of education: Bachelor's Degree?",
+    "Submit your portfolio link",
+])
+def test_fields_that_resemble_prototypes_are_questions(classify, label):
+    assert classify(label) == "question"
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Yes", "option"),
+    ("No", "option"),
+    ("Bachelor's Degree", "option"),
+    ("Select an option", "option"),
+    ("Next", "noise"),
+    ("Submit application", "noise"),
+    ("Submit Application", "noise"),
+    ("Review your application", "noise"),
+    ("Upload resume", "noise"),
+    ("33%", "noise"),
+    ("Step 2 of 4", "noise"),
+    ("Last used on 3/7/2026", "noise"),
+])
+def test_exact_prototypes_are_skipped(classify, label, expected):
+    assert classify(label) == expected
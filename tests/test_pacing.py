@@ -0,0 +1,30 @@
+import threading
+import time
+
+
+class Target:
+    def __init__(self, clicks):
+        self.clicks = clicks
+
+    def click(self):
+        self.clicks.append(time.time())
+
+
+def test_workers_share_one_click_stream(automation, monkeypatch):
+    monkeypatch.setattr(automation, "PACING_MIN_SECONDS", 0.05)
+    monkeypatch.setattr(automation, "PACING_MAX_SECONDS", 0.05)
+    monkeypatch.setitem(automation._next_account_action_at, "click", 0.0)
+    clicks = []
+
+    def worker():
+        for _ in range(2):
+            automation.paced_click(Target(clicks))
+
+    workers = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    clicks.sort()
+    assert len(clicks) == 6
+    assert all(later - earlier >= 0.045 for earlier, later in zip(clicks, clicks[1:]))
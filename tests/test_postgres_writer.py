@@ -0,0 +1,108 @@
+import queue
+
+import pytest
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement):
+        self.connection.statements.append(statement)
+
+    def fetchone(self):
+        return (self.connection.migrated,)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.migrated = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    def getconn(self):
+        return self.connection
+
+    def putconn(self, connection):
+        pass
+
+
+@pytest.fixture
+def postgres(automation, monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(automation, "_pg_schema_ready", False)
+    monkeypatch.setattr(automation, "get_postgres_pool", lambda: pool)
+    return pool.connection
+
+
+def test_schema_is_ready_only_after_a_commit(automation, postgres, monkeypatch):
+    import psycopg2.extras
+
+    def failing_insert(cursor, statement, rows, page_size=None):
+        raise ValueError("bad row")
+
+    monkeypatch.setattr(psycopg2.extras, "execute_values", failing_insert)
+    assert not automation.save_job_to_postgres({"Job Key": "1"})
+    assert postgres.rollbacks == 1
+    assert not automation._pg_schema_ready
+
+    monkeypatch.setattr(psycopg2.extras, "execute_values", lambda cursor, statement, rows, page_size=None: None)
+    assert automation.save_job_to_postgres({"Job Key": "1"})
+    assert automation._pg_schema_ready
+    assert sum("CREATE UNIQUE INDEX" in statement for statement in postgres.statements) == 2
+
+
+def test_migrated_schema_runs_no_ddl(automation, postgres, monkeypatch):
+    import psycopg2.extras
+
+    monkeypatch.setattr(psycopg2.extras, "execute_values", lambda cursor, statement, rows, page_size=None: None)
+    postgres.migrated = True
+    assert automation.save_job_to_postgres({"Job Key": "1"})
+    assert not any(statement.startswith(("ALTER", "CREATE", "DROP")) for statement in postgres.statements)
+
+
+def test_poisoned_batch_falls_back_to_single_rows(automation, monkeypatch):
+    written = []
+    attempts = []
+
+    def save(jobs):
+        jobs = [jobs] if isinstance(jobs, dict) else jobs
+        attempts.append(len(jobs))
+        if any(job["Job Key"] == "bad" for job in jobs):
+            return False
+        written.extend(job["Job Key"] for job in jobs)
+        return True
+
+    monkeypatch.setattr(automation, "save_job_to_postgres", save)
+    monkeypatch.setattr(automation, "DB_FLUSH_EVERY_JOBS", 3)
+    monkeypatch.setattr(automation, "DB_FLUSH_INTERVAL_SECONDS", 60)
+    monkeypatch.setattr(automation, "DB_BATCH_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(automation, "_pg_queue", queue.Queue())
+    for key in ("a", "bad", "c", "d", "e"):
+        automation._pg_queue.put({"Job Key": key, "Job Title": key})
+    automation._pg_queue.put(automation._PG_STOP)
+    automation._postgres_writer_loop()
+    # Three failed batch attempts as jobs keep arriving, then one insert per job
+    assert attempts == [3, 4, 5, 1, 1, 1, 1, 1]
+    assert written == ["a", "c", "d", "e"]
@@ -0,0 +1,27 @@
+import json
+
+
+def test_profiles_get_their_own_warm_browser(automation, tmp_path, monkeypatch):
+    monkeypatch.setattr(automation, "PROFILES_STATE_DIR", str(tmp_path))
+    env = automation.profile_environment({"name": "alice"})
+    assert env["browser_daemon_state_path"] == str(tmp_path / "alice" / "browser_daemon.json")
+    assert env["browser_profile_dir"] == str(tmp_path / "alice" / "browser_profile")
+
+
+def test_warm_browser_of_another_profile_is_not_attached(automation, tmp_path, monkeypatch):
+    state_path = tmp_path / "browser_daemon.json"
+    state_path.write_text(json.dumps({"endpoint": "http://127.0.0.1:9", "pid": 1, "profile": "default"}))
+    contacted = []
+    monkeypatch.setattr(automation, "BROWSER_DAEMON_STATE_PATH", str(state_path))
+    monkeypatch.setattr(automation, "PROFILE_NAME", "alice")
+    monkeypatch.setattr(automation, "get_http_session", lambda: contacted.append(True))
+    assert automation.warm_browser_endpoint() is None
+    assert not contacted
+
+
+def test_user_name_answers_name_fields(automation, monkeypatch):
+    resume = "JANE DOE\njane@example.com\nPython developer\n"
+    assert automation.build_resume_fact_index(resume)["contact"]["full name"] == "Jane Doe"
+    monkeypatch.setattr(automation, "USER_NAME", "Jane McDonald-Doe")
+    contact = automation.build_resume_fact_index(resume)["contact"]
+    assert (contact["full name"], contact["first name"], contact["last name"]) == ("Jane McDonald-Doe", "Jane", "McDonald-Doe")
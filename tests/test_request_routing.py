@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.mark.parametrize("url", [
+    "https://media.licdn.com/dms/image/v2/D4D03AQ/profile-displayphoto-shrink_100_100/0/1?e=1&t=x",
+    "https://static.licdn.com/aero-v1/sc/h/logo.SVG",
+    "https://static.licdn.com/fonts/source-sans.woff2?v=2",
+    "https://px.ads.linkedin.com/collect?pid=1",
+    "https://www.linkedin.com/li/track",
+    "https://www.googletagmanager.com/gtm.js?id=1",
+])
+def test_blocked_urls_are_routed(automation, url):
+    assert automation.blocked_url_regex().search(url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/jobs/search/?keywords=python",
+    "https://www.linkedin.com/voyager/api/jobs/jobPostings/123",
+    "https://static.licdn.com/aero-v1/sc/h/app.js",
+])
+def test_page_requests_are_not_routed(automation, url):
+    assert not automation.blocked_url_regex().search(url)
+
+
+def test_routing_never_intercepts_every_request(automation, monkeypatch):
+    routes = []
+
+    class Context:
+        def on(self, event, handler):
+            pass
+
+        def route(self, url, handler):
+            routes.append(url)
+
+    monkeypatch.setattr(automation, "BLOCK_RESOURCES", True)
+    automation.install_request_routing(Context())
+    assert routes == [automation.blocked_url_regex()]
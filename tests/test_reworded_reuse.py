@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.mark.parametrize("answered, asked", [
+    ("Expected CTC", "Current CTC"),
+    ("Current CTC", "Expected CTC"),
+    ("Expected salary", "Current salary"),
+    ("Email address", "Address"),
+    ("Mobile phone number", "Mobile phone country code"),
+    ("LinkedIn profile URL", "GitHub profile URL"),
+    ("How many years of experience do you have with Java?", "Years of experience with Java Spring?"),
+    ("Can you work from office 5 days a week?", "Can you work from office 3 days a week?"),
+    ("How many years of experience do you have?", "How many years of experience do you have with Go?"),
+])
+def test_distinct_questions_do_not_share_answers(reworded_index, answered, asked):
+    reworded_index.add_to_reworded_index(answered, "earlier answer")
+    assert reworded_index.find_reworded_answer(asked) is None
+
+
+@pytest.mark.parametrize("answered, asked", [
+    ("How many years of experience do you have with Python?", "Years of Python experience"),
+    ("How many years of work experience do you have with Python?", "How many years have you worked with Python?"),
+    ("Expected CTC", "Expected CTC?"),
+    ("Can you work from office 5 days a week?", "Could you work from the office 5 days a week?"),
+    ("Are you willing to relocate?", "Are you open to relocating?"),
+    ("Are you comfortable commuting to this job's location?", "Are you willing to commute to the location?"),
+])
+def test_reworded_questions_reuse_the_answer(reworded_index, answered, asked):
+    reworded_index.add_to_reworded_index(answered, "4")
+    assert reworded_index.find_reworded_answer(asked) == (reworded_index.normalize_label(answered), "4")
+
+
+@pytest.mark.parametrize("words", [
+    ("relocate", "relocating", "relocated", "relocates"),
+    ("degree", "degrees"),
+    ("salary", "salaries"),
+    ("plan", "planning", "planned"),
+    ("experience", "experienced"),
+    ("address", "addresses"),
+])
+def test_inflections_share_a_stem(automation, words):
+    assert len({automation.stem_word(word) for word in words}) == 1
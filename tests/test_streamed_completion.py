@@ -0,0 +1,104 @@
+import json
+import time
+
+import pytest
+
+
+class StreamedResponse:
+    def __init__(self, tokens, delay=0.0):
+        self.lines = [f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}" for token in tokens]
+        self.lines.append("data: [DONE]")
+        self.delay = delay
+
+    def iter_lines(self, chunk_size=None, decode_unicode=False):
+        for line in self.lines:
+            time.sleep(self.delay)
+            yield line
+
+
+def read(automation, response, shape=None, max_tokens=4, deadline_seconds=5.0):
+    fields = {}
+    start = time.perf_counter()
+    answer = automation._read_streamed_completion(
+        response, shape, max_tokens, start, start + deadline_seconds, fields
+    )
+    return answer, fields
+
+
+def test_answer_of_exactly_max_tokens_is_complete(automation):
+    answer, fields = read(automation, StreamedResponse(["I ", "like ", "clean ", "code"]), max_tokens=4)
+    assert answer == "I like clean code"
+    assert fields["tokens"] == 4
+
+
+def test_reaching_max_tokens_ends_the_answer(automation):
+    answer, fields = read(automation, StreamedResponse(["a ", "b ", "c ", "d ", "e"]), max_tokens=3)
+    assert answer == "a b c "
+    assert fields["stop"] == "max_tokens"
+
+
+def test_number_answer_stops_at_shape(automation):
+    answer, fields = read(automation, StreamedResponse(["4", "\n", "years"]), shape="number")
+    assert answer.strip() == "4"
+    assert fields["stop"] == "shape"
+
+
+def test_only_the_deadline_raises(automation):
+    with pytest.raises(TimeoutError):
+        read(automation, StreamedResponse(["a ", "b ", "c "], delay=0.05), deadline_seconds=0.08)
+
+
+@pytest.fixture
+def llm_answer(automation, monkeypatch):
+    def answer(question, raw_answer):
+        monkeypatch.setattr(automation, "OPENWEBUI_API", "http://llm.invalid")
+        monkeypatch.setattr(automation, "api_token", "token")
+        monkeypatch.setattr(automation, "resume_prompt_context", lambda question, file_id: "")
+        monkeypatch.setattr(automation, "post_chat_completion", lambda *args, **kwargs: raw_answer)
+        return automation.get_answer_from_llm(question, None)
+
+    return answer
+
+
+@pytest.mark.parametrize("raw_answer", ["No", "No.", "No, I do not", "no"])
+def test_no_is_kept_for_yes_no_questions(llm_answer, raw_answer):
+    assert llm_answer("Do you require visa sponsorship?", raw_answer) == "No"
+
+
+@pytest.mark.parametrize("raw_answer", ["Yes", "Yes.", "yes, I am"])
+def test_yes_is_normalized(llm_answer, raw_answer):
+    assert llm_answer("Are you willing to relocate?", raw_answer) == "Yes"
+
+
+@pytest.mark.parametrize("question, raw_answer", [
+    ("Describe your notice period", "no"),
+    ("How many years of experience do you have with Rust?", "0"),
+    ("Describe your notice period", "n/a"),
+])
+def test_invalid_answers_are_blank(llm_answer, question, raw_answer):
+    assert llm_answer(question, raw_answer) == ""
+
+
+@pytest.mark.parametrize("raw_answer, expected", [
+    ("12,00,000", "1200000"),
+    ("120,000", "120000"),
+    ("1,200,000 INR", "1200000"),
+    ("4.5 years", "4.5"),
+    ("7, based on the resume", "7"),
+])
+def test_grouped_amounts_are_kept_whole(llm_answer, raw_answer, expected):
+    assert llm_answer("What is your expected salary?", raw_answer) == expected
+
+
+@pytest.mark.parametrize("text, complete", [
+    ("12,", False),
+    ("12,00", False),
+    ("12,00,000", False),
+    ("12,00,000\n", True),
+    ("120,000 INR", True),
+    ("4.", False),
+    ("4.5 ", True),
+    ("7, based", True),
+])
+def test_number_shape_waits_for_grouped_amounts(automation, text, complete):
+    assert automation.answer_shape_complete(text, "number") is complete